@@ -0,0 +1,120 @@
+# analytics.py
+"""
+Analitika iz dnevnih zbrojeva: prijave po događaju i danu, poruke po danu.
+
+Tablica `daily_stat` ima jedan redak po (izvor, dan, događaj) i mijenja se
+u ISTOJ transakciji kao i nova prijava ili poruka (ORM event, vidi
+counters.track_daily). /admin/analytics i /admin/analytics.json čitaju samo
+nju: godina podataka je najviše 365 redaka po događaju, bez obzira na to
+koliko prijava ima u bazi.
+
+Zbrojevi broje ono što je stiglo – brisanje i arhiviranje ih ne mijenjaju.
+Dani su po UTC-u (kao i datumi zapisa). `flask analytics-rebuild` ih iznova
+računa iz vruće baze i arhive, npr. nakon prvog deploya na postojeću bazu.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import String, cast, delete, func, insert, literal, select
+
+from concurrency import write_transaction
+from models import ArchivedContact, ArchivedRegistration, DailyStat, Event, DAILY_MODELS
+
+ARCHIVES = {"contact": ArchivedContact, "event_registration": ArchivedRegistration}
+MAX_DAYS = 3660
+
+
+def date_range(dani, do=None):
+    """(od, do) kao date; zadnji dan je danas (UTC)."""
+    do = do or datetime.utcnow().date()
+    dani = max(1, min(dani, MAX_DAYS))
+    return do - timedelta(days=dani - 1), do
+
+
+def daily_series(db, tablica, od, do, event_id=None):
+    """[broj po danu] od `od` do `do` uključivo, s nulama za dane bez zapisa."""
+    s = DailyStat.__table__
+    upit = (
+        select(s.c.dan, func.sum(s.c.broj))
+        .where(s.c.tablica == tablica, s.c.dan >= od.isoformat(), s.c.dan <= do.isoformat())
+        .group_by(s.c.dan)
+    )
+    if event_id is not None:
+        upit = upit.where(s.c.event_id == event_id)
+    po_danu = dict(db.session.execute(upit).all())
+    return [int(po_danu.get((od + timedelta(days=i)).isoformat()) or 0) for i in range((do - od).days + 1)]
+
+
+def top_events(db, od, do, limit=10):
+    """[(event_id, naziv, broj prijava)] u razdoblju, najviše prijava prvo."""
+    s = DailyStat.__table__
+    ukupno = func.sum(s.c.broj).label("broj")
+    retci = db.session.execute(
+        select(s.c.event_id, ukupno)
+        .where(s.c.tablica == "event_registration", s.c.dan >= od.isoformat(), s.c.dan <= do.isoformat())
+        .group_by(s.c.event_id)
+        .order_by(ukupno.desc())
+        .limit(limit)
+    ).all()
+    ids = [event_id for event_id, _ in retci if event_id]
+    nazivi = dict(db.session.execute(select(Event.id, Event.naziv).where(Event.id.in_(ids))).all()) if ids else {}
+    return [
+        (event_id, nazivi.get(event_id) or (f"#{event_id} (obrisan)" if event_id else "bez događaja"), int(broj))
+        for event_id, broj in retci
+    ]
+
+
+def bar_path(series, width=1000, height=120):
+    """SVG path stupčastog grafa (jedan <path> za cijelu seriju) i najveća vrijednost."""
+    najvise = max(series, default=0)
+    if not najvise:
+        return "", 0
+    korak = width / len(series)
+    sirina = max(korak * 0.8, 0.5)
+    dijelovi = []
+    for i, broj in enumerate(series):
+        if broj:
+            h = height * broj / najvise
+            dijelovi.append(f"M{i * korak:.1f} {height}h{sirina:.1f}v{-h:.1f}h{-sirina:.1f}z")
+    return "".join(dijelovi), najvise
+
+
+# 🔹 Ponovni izračun iz sirovih redaka (vruća baza + arhiva)
+def rebuild(db):
+    """Iznova izračunaj sve dnevne zbrojeve; vraća {izvor: broj redaka}."""
+    s = DailyStat.__table__
+    zbrojevi, obradeno, arhiva = {}, {}, {}
+    for name, (_model, date_field, group_field) in DAILY_MODELS.items():
+        # Arhiva je zasebna baza – čita se prije transakcije nad vrućom bazom
+        with db.engines["archive"].connect() as conn:
+            arhiva[name] = conn.execute(_daily_counts(ARCHIVES[name].__table__, date_field, group_field)).all()
+
+    def izracunaj():
+        zbrojevi.clear()  # write_transaction može ponoviti cijelu funkciju
+        obradeno.clear()
+        db.session.execute(delete(s).where(s.c.tablica.in_(list(DAILY_MODELS))))
+        for name, (model, date_field, group_field) in DAILY_MODELS.items():
+            vruci = db.session.execute(_daily_counts(model.__table__, date_field, group_field)).all()
+            obradeno[name] = 0
+            for dan, event_id, broj in list(vruci) + list(arhiva[name]):
+                kljuc = (name, dan, event_id or 0)
+                zbrojevi[kljuc] = zbrojevi.get(kljuc, 0) + broj
+                obradeno[name] += broj
+        if zbrojevi:
+            db.session.execute(insert(s), [
+                {"tablica": t, "dan": d, "event_id": e, "broj": b} for (t, d, e), b in zbrojevi.items()
+            ])
+        db.session.commit()
+
+    write_transaction(db, izracunaj)
+    return obradeno
+
+
+def _daily_counts(table, date_field, group_field):
+    # "2024-05-01 10:00:00.123" → "2024-05-01" (isto u SQLite-u i Postgresu)
+    dan = func.substr(cast(table.c[date_field], String), 1, 10)
+    grupa = table.c[group_field] if group_field else literal(0)
+    return (
+        select(dan, grupa, func.count())
+        .where(table.c[date_field].is_not(None))
+        .group_by(dan, grupa)
+    )
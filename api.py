@@ -0,0 +1,103 @@
+# api.py
+"""
+JSON API (samo čitanje) za tečajeve i događaje: /api/courses, /api/events.
+
+    ?fields=id,naziv        – samo ovi stupci (id je uvijek uključen)
+    ?ids=3,7,12             – točno ovi zapisi, jednim IN upitom
+    ?after=<id>&limit=50    – keyset paginacija po id-u (uzlazno)
+
+Ostali parametri (utm_source i sl.) se ignoriraju. ETag i ključ u cacheu
+računaju se iz parsiranih parametara (parse_query), ne iz sirovog query
+stringa, pa ?utm=1, ?utm=2... ne stvaraju nove zapise u cacheu.
+
+Upiti idu preko Core selecta samo s traženim stupcima (bez ORM objekata),
+a gotov JSON sprema se u page cache pod ETagom – ponovljeni zahtjev je
+jedno čitanje verzija tablice + jedno čitanje cachea (ili 304).
+"""
+import json
+
+from sqlalchemy import select
+
+from models import Course, Event
+
+# resurs → (model, javni stupci, ime u table_version / page cache namespace)
+RESOURCES = {
+    "courses": (Course, ("id", "naziv", "opis", "cijena"), "course"),
+    # broj_prijava namjerno nije javan: mijenja se sa svakom prijavom bez nove verzije tablice
+    "events": (Event, ("id", "naziv", "opis", "kapacitet"), "event"),
+}
+MAX_IDS = 100
+MAX_LIMIT = 200
+
+
+class ApiError(ValueError):
+    """Neispravan parametar upita → 400."""
+
+
+def parse_fields(value, allowed):
+    if not value:
+        return allowed
+    trazeno = [f.strip() for f in value.split(",") if f.strip()]
+    nepoznato = [f for f in trazeno if f not in allowed]
+    if nepoznato:
+        raise ApiError(f"Nepoznata polja: {', '.join(nepoznato)} (dozvoljeno: {', '.join(allowed)})")
+    return ("id",) + tuple(f for f in allowed if f in trazeno and f != "id")
+
+
+def parse_ids(value):
+    if value is None:
+        return None
+    try:
+        ids = sorted({int(v) for v in value.split(",") if v.strip()})
+    except ValueError:
+        raise ApiError("ids mora biti popis cijelih brojeva odvojenih zarezom") from None
+    if not ids or len(ids) > MAX_IDS:
+        raise ApiError(f"ids: od 1 do {MAX_IDS} vrijednosti")
+    return ids
+
+
+def parse_after(value):
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError("after mora biti cijeli broj") from None
+
+
+def parse_limit(value, default):
+    try:
+        limit = int(value) if value is not None else default
+    except ValueError:
+        raise ApiError("limit mora biti cijeli broj") from None
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def parse_query(args, allowed, per_page):
+    """(fields, ids, after, limit) iz query stringa – isti upit uvijek daje istu četvorku."""
+    fields = parse_fields(args.get("fields"), allowed)
+    ids = parse_ids(args.get("ids"))
+    if ids is not None:
+        return fields, tuple(ids), None, None  # after/limit se uz ids ne koriste
+    return fields, None, parse_after(args.get("after")), parse_limit(args.get("limit"), per_page)
+
+
+def build_payload(db, resource, fields, ids=None, after=None, limit=50):
+    """JSON string odgovora – ovo se sprema u cache."""
+    model, _allowed, _table = RESOURCES[resource]
+    table = model.__table__
+    upit = select(*[table.c[f] for f in fields])
+
+    if ids is not None:
+        rows = db.session.execute(upit.where(table.c.id.in_(ids)).order_by(table.c.id)).all()
+        data = [dict(zip(fields, row)) for row in rows]
+        pronadeni = {d["id"] for d in data}
+        payload = {"data": data, "missing": [i for i in ids if i not in pronadeni]}
+    else:
+        if after is not None:
+            upit = upit.where(table.c.id > after)
+        rows = db.session.execute(upit.order_by(table.c.id).limit(limit + 1)).all()
+        data = [dict(zip(fields, row)) for row in rows[:limit]]
+        payload = {"data": data, "next_after": data[-1]["id"] if len(rows) > limit else None}
+
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
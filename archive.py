@@ -0,0 +1,131 @@
+# archive.py
+"""
+Arhiviranje starih poruka (Contact) i prijava (EventRegistration).
+
+Obje tablice samo rastu, a svaki backup, izvoz i brojanje nosi sve retke.
+`flask archive` seli retke starije od ARCHIVE_AFTER_DAYS u zasebnu bazu
+(bind "archive", zadano archive.db) u serijama od ARCHIVE_BATCH redaka:
+
+  1. serija se upiše u arhivu (retci koji su već tamo se preskaču)
+  2. u vrućoj bazi, u JEDNOJ transakciji: obriši seriju, dodaj je u
+     `archive_summary` (broj po mjesecu i događaju), smanji table_counter
+
+Ako proces padne između 1. i 2., sljedeće pokretanje iste retke samo
+preskoči u arhivi i dovrši brisanje – ništa se ne izgubi ni ne broji dvaput.
+
+Event.broj_prijava se ne mijenja (arhivirane prijave i dalje zauzimaju
+mjesto), a dashboard ukupne brojeve računa kao vruće + sažetak arhive.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select, update
+
+from concurrency import write_transaction
+from counters import bump_count, bump_version
+from models import (
+    ArchiveSummary, ArchivedContact, ArchivedRegistration, Contact, EventRegistration,
+    TableCounter, TableVersion, VERSIONED_MODELS,
+)
+
+# izvor → (vrući model, arhivski model, stupac datuma, ime brojača)
+SOURCES = {
+    "contacts": (Contact, ArchivedContact, "datum_poruke", "contact"),
+    "registrations": (EventRegistration, ArchivedRegistration, "datum_prijave", "event_registration"),
+}
+
+
+def archive_old(db, older_than_days, batch=1000, log=print):
+    """Preseli sve retke starije od `older_than_days` dana; vraća {izvor: broj}."""
+    granica = datetime.utcnow() - timedelta(days=older_than_days)
+    preseljeno = {}
+    for source in SOURCES:
+        ukupno = 0
+        while True:
+            n = _archive_batch(db, source, granica, batch)
+            if not n:
+                break
+            ukupno += n
+            log(f"  {source}: {ukupno}")
+        preseljeno[source] = ukupno
+    return preseljeno
+
+
+def _archive_batch(db, source, granica, batch):
+    model, archive_model, date_field, counter = SOURCES[source]
+    table, archive_table = model.__table__, archive_model.__table__
+    datum = table.c[date_field]
+
+    rows = db.session.execute(
+        select(table).where(datum < granica).order_by(table.c.id).limit(batch)
+    ).mappings().all()
+    db.session.rollback()  # ne drži čitanje otvoreno dok se piše u arhivu
+    if not rows:
+        return 0
+    ids = [r["id"] for r in rows]
+
+    # 1) Arhiva – zasebna baza i transakcija
+    with db.engines["archive"].begin() as conn:
+        vec_tamo = set(conn.execute(
+            select(archive_table.c.id).where(archive_table.c.id.in_(ids))
+        ).scalars())
+        sada = datetime.utcnow()
+        novi = [
+            {**{c.name: r.get(c.name) for c in archive_table.columns}, "arhivirano": sada}
+            for r in rows if r["id"] not in vec_tamo
+        ]
+        if novi:
+            conn.execute(insert(archive_table), novi)
+
+    # 2) Vruća baza – brisanje, sažetak i brojač zajedno. RETURNING: broje se
+    #    samo retci koji su stvarno obrisani (admin je neki mogao obrisati u međuvremenu)
+    stupci = [datum] + ([table.c.event_id] if "event_id" in table.c else [])
+
+    def preseli():
+        obrisani = db.session.execute(
+            delete(table).where(table.c.id.in_(ids)).returning(*stupci)
+        ).all()
+        po_mjesecu = {}
+        for r in obrisani:
+            kljuc = (r[0].strftime("%Y-%m"), (r[1] if len(r) > 1 else None) or 0)
+            po_mjesecu[kljuc] = po_mjesecu.get(kljuc, 0) + 1
+        for (mjesec, event_id), broj in po_mjesecu.items():
+            _add_summary(db, counter, mjesec, event_id, broj)
+        if obrisani:
+            bump_count(db, TableCounter, counter, -len(obrisani))
+            if counter in VERSIONED_MODELS:
+                bump_version(db, TableVersion, counter)
+        db.session.commit()
+        return len(obrisani)
+
+    write_transaction(db, preseli)
+    return len(rows)
+
+
+def _add_summary(db, tablica, mjesec, event_id, broj):
+    # Arhiviranje radi jedan proces (flask archive), pa je update-ili-insert dovoljan
+    s = ArchiveSummary.__table__
+    kljuc = (s.c.tablica == tablica) & (s.c.mjesec == mjesec) & (s.c.event_id == event_id)
+    if not db.session.execute(update(s).where(kljuc).values(broj=s.c.broj + broj)).rowcount:
+        db.session.execute(insert(s).values(tablica=tablica, mjesec=mjesec, event_id=event_id, broj=broj))
+
+
+def archived_totals(db, event_id=None):
+    """{"contact": n, "event_registration": n} iz sažetka (bez upita nad arhivom)."""
+    s = ArchiveSummary.__table__
+    upit = select(s.c.tablica, func.sum(s.c.broj)).group_by(s.c.tablica)
+    if event_id is not None:
+        upit = upit.where(s.c.event_id == event_id)
+    totals = dict(db.session.execute(upit).all())
+    return {counter: int(totals.get(counter) or 0) for _m, _a, _d, counter in SOURCES.values()}
+
+
+def summary_by_month(db, source, limit=24):
+    counter = SOURCES[source][3]
+    s = ArchiveSummary.__table__
+    return db.session.execute(
+        select(s.c.mjesec, func.sum(s.c.broj))
+        .where(s.c.tablica == counter)
+        .group_by(s.c.mjesec)
+        .order_by(s.c.mjesec.desc())
+        .limit(limit)
+    ).all()
@@ -0,0 +1,272 @@
+# assets.py
+"""
+Statičke datoteke s otiskom sadržaja (fingerprint).
+
+`flask build-assets`:
+  1. preuzme Bootstrap i bootstrap-icons u static/vendor/ (ako već nisu tamo)
+  2. svaku datoteku iz static/ kopira u static/dist/ kao ime.<hash>.ext
+  3. za CSS/JS/SVG doda .gz (i .br ako je instaliran `brotli`)
+  4. za slike napravi manje WebP varijante za srcset (ako je instaliran `Pillow`)
+  5. zapiše static/dist/manifest.json
+
+U predlošcima `asset_url('vendor/bootstrap.min.css')` vraća /assets/<hashirano ime>.
+Takav URL se nikad ne mijenja dok se ne promijeni sadržaj, pa ga preglednik
+smije čuvati godinu dana bez ponovne provjere. Bez builda (ili ako datoteka
+nije u manifestu) vraća se obični /static/ URL, a za vendor datoteke CDN.
+"""
+import gzip
+import hashlib
+import io
+import json
+import mimetypes
+import os
+import re
+import urllib.request
+
+from flask import abort, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # u requirements.txt; bez njega build radi samo .gz (uz upozorenje)
+    brotli = None
+
+try:
+    from PIL import Image
+except ImportError:  # u requirements.txt; bez njega nema responzivnih varijanti (uz upozorenje)
+    Image = None
+
+# logičko ime: CDN URL (koristi se i kao rezerva dok build nije pokrenut)
+VENDOR = {
+    "vendor/bootstrap.min.css": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/css/bootstrap.min.css",
+    "vendor/bootstrap.bundle.min.js": "https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js",
+    "vendor/bootstrap-icons.min.css": "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css",
+    "vendor/fonts/bootstrap-icons.woff2": "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/fonts/bootstrap-icons.woff2",
+    "vendor/fonts/bootstrap-icons.woff": "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/fonts/bootstrap-icons.woff",
+}
+
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt")
+IMAGES = (".jpg", ".jpeg", ".png")
+IMAGE_WIDTHS = (320, 640, 1280)
+MANIFEST = "manifest.json"
+MAX_AGE = 365 * 24 * 3600
+
+_CSS_URL = re.compile(r"url\(\s*(['\"]?)([^'\")]+)\1\s*\)")
+_SOURCE_MAP = re.compile(r"/[*/]# sourceMappingURL=[^\n]*")
+
+
+# ─── Build ──────────────────────────────────────────────────────────────────
+
+def _hashed_name(name, data):
+    digest = hashlib.sha256(data).hexdigest()[:12]
+    base, ext = os.path.splitext(name)
+    return f"{base}.{digest}{ext}"
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+
+
+def fetch_vendor(static_dir, log=print):
+    """Preuzmi vendor datoteke koje još nisu u static/vendor/."""
+    for name, url in VENDOR.items():
+        path = os.path.join(static_dir, name)
+        if os.path.exists(path):
+            continue
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                _write(path, response.read())
+            log(f"⬇️  {name}")
+        except OSError as e:
+            log(f"⚠️ {name} nije preuzet ({e}) – predlošci će koristiti CDN")
+
+
+def _sources(static_dir, out_dir):
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != out_dir]
+        for filename in files:
+            path = os.path.join(root, filename)
+            yield os.path.relpath(path, static_dir).replace(os.sep, "/"), path
+
+
+def _rewrite_css(name, data, files):
+    """url(fonts/x.woff2?v=1) → url(fonts/x.<hash>.woff2), relativno prema CSS datoteci."""
+    folder = os.path.dirname(name)
+
+    def zamijeni(match):
+        quote, ref = match.groups()
+        if ref.startswith(("data:", "http:", "https:", "/", "#")):
+            return match.group(0)
+        path, _, suffix = ref.partition("#")
+        path = path.split("?")[0]
+        target = os.path.normpath(os.path.join(folder, path)).replace(os.sep, "/")
+        if target not in files:
+            return match.group(0)
+        novo = os.path.relpath(files[target], folder or ".").replace(os.sep, "/")
+        return f"url({quote}{novo}{'#' + suffix if suffix else ''}{quote})"
+
+    text = _SOURCE_MAP.sub("", data.decode("utf-8"))
+    return _CSS_URL.sub(zamijeni, text).encode("utf-8")
+
+
+def _compress(path, data):
+    encodings = []
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        _write(path + ".gz", gz)
+        encodings.append("gzip")
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            _write(path + ".br", br)
+            encodings.append("br")
+    return encodings
+
+
+def _image_variants(name, source_path, out_dir):
+    if Image is None:
+        return []
+    varijante = []
+    with Image.open(source_path) as img:
+        for width in IMAGE_WIDTHS:
+            if width >= img.width:
+                break
+            height = round(img.height * width / img.width)
+            resized = img.convert("RGB").resize((width, height), Image.LANCZOS)
+            buf = io.BytesIO()
+            resized.save(buf, "WEBP", quality=80, method=6)
+            base = os.path.splitext(name)[0]
+            hashed = _hashed_name(f"{base}.{width}w.webp", buf.getvalue())
+            _write(os.path.join(out_dir, hashed), buf.getvalue())
+            varijante.append([hashed, width])
+    return varijante
+
+
+def build(static_dir, out_dir, fetch=True, log=print):
+    """Izgradi static/dist/ i manifest. Vraća manifest (dict)."""
+    if fetch:
+        fetch_vendor(static_dir, log)
+    if brotli is None:
+        log("⚠️ paket `brotli` nije instaliran (requirements.txt) – bez .br varijanti, samo gzip")
+    if Image is None:
+        log("⚠️ paket `Pillow` nije instaliran (requirements.txt) – bez responzivnih varijanti slika")
+
+    files, encodings, srcset = {}, {}, {}
+    # CSS na kraju, da bi url(...) reference već imale hashirana imena
+    izvori = sorted(_sources(static_dir, out_dir), key=lambda item: (item[0].endswith(".css"), item[0]))
+    for name, path in izvori:
+        with open(path, "rb") as f:
+            data = f.read()
+        if name.endswith(".css"):
+            data = _rewrite_css(name, data, files)
+
+        hashed = _hashed_name(name, data)
+        target = os.path.join(out_dir, hashed)
+        if not os.path.exists(target):
+            _write(target, data)
+        files[name] = hashed
+
+        if name.endswith(COMPRESSIBLE):
+            encodings[hashed] = _compress(target, data)
+        if name.lower().endswith(IMAGES):
+            varijante = _image_variants(name, path, out_dir)
+            if varijante:
+                srcset[name] = varijante + [[hashed, _image_width(path)]]
+        log(f"✅ {name} → {hashed}")
+
+    manifest = {"files": files, "encodings": encodings, "srcset": srcset}
+    _write(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=1).encode("utf-8"))
+    return manifest
+
+
+def _image_width(path):
+    with Image.open(path) as img:
+        return img.width
+
+
+def clean(out_dir, manifest, log=print):
+    """Obriši hashirane datoteke koje više nisu u manifestu (starije buildove)."""
+    zadrzi = {MANIFEST}
+    for hashed in manifest["files"].values():
+        zadrzi.update({hashed, hashed + ".gz", hashed + ".br"})
+    for varijante in manifest["srcset"].values():
+        zadrzi.update(hashed for hashed, _ in varijante)
+    for name, path in list(_sources(out_dir, out_dir)):
+        if name not in zadrzi:
+            os.remove(path)
+            log(f"🗑️  {name}")
+
+
+# ─── Flask ──────────────────────────────────────────────────────────────────
+
+class Assets:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.manifest = {"files": {}, "encodings": {}, "srcset": {}}
+        self.served = set()
+        self._mtime = None
+
+    def load(self):
+        """Učitaj manifest ako se promijenio (u debug načinu prije svakog zahtjeva)."""
+        path = os.path.join(self.out_dir, MANIFEST)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._mtime:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.served = set(manifest["files"].values()) | {
+                hashed for varijante in manifest["srcset"].values() for hashed, _ in varijante
+            }
+            self.manifest, self._mtime = manifest, mtime
+
+    def url(self, name):
+        hashed = self.manifest["files"].get(name)
+        if hashed:
+            return url_for("assets", filename=hashed)
+        if name in VENDOR:
+            return VENDOR[name]
+        return url_for("static", filename=name)
+
+    def srcset(self, name):
+        return ", ".join(
+            f"{url_for('assets', filename=hashed)} {width}w"
+            for hashed, width in self.manifest["srcset"].get(name, [])
+        )
+
+    def send(self, filename):
+        if filename not in self.served:
+            abort(404)
+        manifest = self.manifest
+
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        prihvaca = request.accept_encodings
+        for coding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if coding in manifest["encodings"].get(filename, ()) and coding in prihvaca:
+                response = send_from_directory(self.out_dir, filename + suffix, mimetype=mimetype)
+                response.headers["Content-Encoding"] = coding
+                break
+        else:
+            response = send_from_directory(self.out_dir, filename, mimetype=mimetype)
+
+        response.headers["Cache-Control"] = f"public, max-age={MAX_AGE}, immutable"
+        if filename in manifest["encodings"]:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+def init_app(app):
+    assets = Assets(app.config["ASSETS_DIR"])
+    assets.load()
+    app.extensions["assets"] = assets
+    app.add_url_rule("/assets/<path:filename>", "assets", assets.send)
+    app.jinja_env.globals.update(asset_url=assets.url, asset_srcset=assets.srcset)
+
+    @app.before_request
+    def reload_manifest():
+        # U razvoju se novi build vidi bez restarta; u produkciji manifest se čita jednom
+        if app.debug:
+            assets.load()
@@ -0,0 +1,380 @@
+# backup.py
+"""
+Backup SQLite baze: online kopija + spremište komada adresiranih sadržajem.
+
+Kopija se radi preko SQLite online backup API-ja (sqlite3.Connection.backup),
+stranicu po stranicu, pa je konzistentna i dok netko piše u bazu. Kopija se
+zatim reže na komade fiksne veličine (višekratnik stranice baze); svaki komad
+sprema se komprimiran pod svojim SHA-256:
+
+    backup/
+      chunks/ab/ab12…ef.z      – sadržaj komada (zlib), ime = sha256 sadržaja
+      snapshots/<id>.json      – popis komada jedne kopije + sha256 cijele baze
+      manifest.json            – sažetak svih kopija (čita ga admin dashboard)
+
+Stranice koje se nisu mijenjale daju iste komade, pa ih nova kopija samo
+referencira – deset kopija baze od 100 MB s malo promjena zauzima malo više
+od jedne. Retencija (zadnjih N + po jedna po satu/danu/tjednu) briše stare
+kopije, a komade koje više nitko ne referencira briše garbage collection.
+
+Raspored: pozadinska nit u svakom procesu svakih BACKUP_INTERVAL sekundi
+provjeri otisak baze i radi backup samo ako je bilo upisa. Ruta može
+zatražiti backup odmah (request()), ali ne češće od BACKUP_MIN_GAP. Između
+procesa backup štiti flock na backup/.lock, pa radi samo jedan worker.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows – nema zaključavanja između procesa
+    fcntl = None
+
+from concurrency import os_threading, start_os_thread
+from metrics import registry
+
+MANIFEST = "manifest.json"
+CHUNKS = "chunks"
+SNAPSHOTS = "snapshots"
+LOCK = ".lock"
+# Stari format (cijela baza kao .db.gz) – restore ih još zna pročitati
+LEGACY_PREFIX = "versus_backup_"
+LEGACY_SUFFIX = ".db.gz"
+
+# Retencija po razdobljima: (ime postavke, format ključa razdoblja)
+POLICIES = (
+    ("hourly", "%Y-%m-%d %H"),
+    ("daily", "%Y-%m-%d"),
+    ("weekly", "%G-W%V"),
+)
+
+
+class BackupManager:
+    def __init__(self, db_path, backup_dir, keep=3, hourly=24, daily=7, weekly=8,
+                 chunk_size=64 * 1024, interval=0, min_gap=60, pages=256, sleep=0.005):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.retention = {"hourly": hourly, "daily": daily, "weekly": weekly}
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.min_gap = min_gap
+        self.pages = pages
+        self.sleep = sleep
+
+        # Prava OS nit i primitivi i pod gevent-om: online backup, zlib i sha256
+        # su blokirajući C pozivi – u greenletu bi zaustavili sve zahtjeve workera
+        self._lock = os_threading("Lock")()
+        self._pending = os_threading("Event")()
+        self._thread = None
+        self._pid = None
+        self._last_run = 0.0
+
+    # 🔹 Otisak baze – mijenja se sa svakim commitom (i u WAL načinu)
+    def fingerprint(self):
+        dijelovi = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                st = os.stat(path)
+                dijelovi.append(f"{st.st_size}:{st.st_mtime_ns}")
+            except FileNotFoundError:
+                dijelovi.append("-")
+        with open(self.db_path, "rb") as f:
+            header = f.read(100)
+        # bajtovi 24-27 zaglavlja: "file change counter"
+        dijelovi.append(header[24:28].hex() if len(header) >= 28 else "-")
+        return "|".join(dijelovi)
+
+    def read_manifest(self):
+        return _read_json(os.path.join(self.backup_dir, MANIFEST)) or {}
+
+    def read_snapshot(self, snapshot_id):
+        snapshot = _read_json(os.path.join(self.backup_dir, SNAPSHOTS, f"{snapshot_id}.json"))
+        if snapshot is None:
+            raise FileNotFoundError(f"Backup '{snapshot_id}' ne postoji")
+        return snapshot
+
+    def run(self, force=False, wait=True):
+        """
+        Napravi backup odmah (u pozivajućoj niti).
+        Vraća id nove kopije ili None ako je backup preskočen.
+        """
+        t0 = time.perf_counter()
+        snapshot_id = self._run(force, wait)
+        registry.observe("versus_backup_duration_seconds", time.perf_counter() - t0,
+                         result="created" if snapshot_id else "skipped")
+        registry.flush()
+        return snapshot_id
+
+    def _run(self, force, wait):
+        if not self.db_path or not os.path.exists(self.db_path):
+            print("⚠️ Baza nije pronađena (backup radi samo za SQLite)!")
+            return None
+
+        os.makedirs(self.backup_dir, exist_ok=True)
+        with self._lock, _FileLock(os.path.join(self.backup_dir, LOCK), wait) as zakljucano:
+            if not zakljucano:
+                return None  # drugi proces upravo radi backup
+            self._last_run = time.monotonic()
+            manifest = self.read_manifest()
+            otisak = self.fingerprint()
+            if not force and manifest.get("fingerprint") == otisak:
+                return None
+
+            raw_path = os.path.join(self.backup_dir, f".backup-{os.getpid()}.raw")
+            try:
+                self._copy_online(raw_path)
+                snapshot = self._store_chunks(raw_path)
+            finally:
+                if os.path.exists(raw_path):
+                    os.remove(raw_path)
+
+            snapshots = manifest.get("snapshots", [])
+            # Sadržaj isti kao zadnji put (npr. samo checkpoint) – ne treba nova kopija
+            if not force and snapshots and snapshots[-1]["sha256"] == snapshot["sha256"]:
+                manifest["fingerprint"] = otisak
+                _write_json(os.path.join(self.backup_dir, MANIFEST), manifest)
+                return None
+
+            snapshot["id"] = self._new_id(snapshots)
+            _write_json(os.path.join(self.backup_dir, SNAPSHOTS, f"{snapshot['id']}.json"), snapshot)
+            snapshots.append({k: v for k, v in snapshot.items() if k != "chunks"})
+
+            manifest["fingerprint"] = otisak
+            manifest["snapshots"] = self._apply_retention(snapshots)
+            manifest["latest"] = manifest["snapshots"][-1]
+            manifest["stored_bytes"] = self._collect_garbage(manifest["snapshots"])
+            _write_json(os.path.join(self.backup_dir, MANIFEST), manifest)
+            print(f"✅ Backup kreiran: {snapshot['id']} "
+                  f"({snapshot['new_chunks']}/{len(snapshot['chunks'])} novih komada)")
+            return snapshot["id"]
+
+    def _copy_online(self, dest_path):
+        src = sqlite3.connect(self.db_path)
+        dst = sqlite3.connect(dest_path)
+        try:
+            # pages po koraku + kratka pauza: pisci nisu blokirani cijelo vrijeme
+            src.backup(dst, pages=self.pages, sleep=self.sleep)
+        finally:
+            dst.close()
+            src.close()
+
+    def _store_chunks(self, raw_path):
+        with open(raw_path, "rb") as f:
+            header = f.read(100)
+        page_size = int.from_bytes(header[16:18], "big") if len(header) >= 18 else 4096
+        page_size = 65536 if page_size == 1 else page_size or 4096
+        # Granice komada padaju na granice stranica, pa nepromijenjena stranica daje isti komad
+        chunk_size = max(page_size, self.chunk_size // page_size * page_size)
+
+        cijela, komadi, novi, novi_bajtovi = hashlib.sha256(), [], 0, 0
+        with open(raw_path, "rb") as f:
+            for data in iter(lambda: f.read(chunk_size), b""):
+                cijela.update(data)
+                digest = hashlib.sha256(data).hexdigest()
+                path = self._chunk_path(digest)
+                if not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    packed = zlib.compress(data, 6)
+                    with open(path + ".tmp", "wb") as out:
+                        out.write(packed)
+                    os.replace(path + ".tmp", path)
+                    novi += 1
+                    novi_bajtovi += len(packed)
+                komadi.append(digest)
+
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "size": os.path.getsize(raw_path),
+            "sha256": cijela.hexdigest(),
+            "page_size": page_size,
+            "chunk_size": chunk_size,
+            "new_chunks": novi,
+            "new_bytes": novi_bajtovi,
+            "chunks": komadi,
+        }
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.backup_dir, CHUNKS, digest[:2], f"{digest}.z")
+
+    def _new_id(self, snapshots):
+        base = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        postojeci = {s["id"] for s in snapshots}
+        snapshot_id, n = base, 1
+        while snapshot_id in postojeci:
+            n += 1
+            snapshot_id = f"{base}-{n}"
+        return snapshot_id
+
+    # 🔹 Retencija: zadnjih `keep` + najnovija kopija u svakom od zadnjih N sati/dana/tjedana
+    def _apply_retention(self, snapshots):
+        najnovije = sorted(snapshots, key=lambda s: s["created"], reverse=True)
+        zadrzi = {s["id"] for s in najnovije[:max(self.keep, 1)]}
+        for name, fmt in POLICIES:
+            kljucevi = set()
+            for s in najnovije:
+                if len(kljucevi) >= self.retention[name]:
+                    break
+                kljuc = datetime.fromisoformat(s["created"]).strftime(fmt)
+                if kljuc not in kljucevi:
+                    kljucevi.add(kljuc)
+                    zadrzi.add(s["id"])
+
+        for s in snapshots:
+            if s["id"] not in zadrzi:
+                try:
+                    os.remove(os.path.join(self.backup_dir, SNAPSHOTS, f"{s['id']}.json"))
+                except FileNotFoundError:
+                    pass
+        return [s for s in snapshots if s["id"] in zadrzi]
+
+    def _collect_garbage(self, snapshots):
+        """Obriši komade koje ne referencira nijedna kopija; vraća zauzeće spremišta."""
+        koristeni = set()
+        for s in snapshots:
+            koristeni.update(self.read_snapshot(s["id"])["chunks"])
+        ukupno = 0
+        root = os.path.join(self.backup_dir, CHUNKS)
+        for folder in (os.listdir(root) if os.path.isdir(root) else []):
+            for name in os.listdir(os.path.join(root, folder)):
+                path = os.path.join(root, folder, name)
+                if name[:-2] in koristeni:
+                    ukupno += os.path.getsize(path)
+                else:
+                    os.remove(path)
+        return ukupno
+
+    # 🔹 Vraćanje kopije
+    def materialize(self, snapshot_id, dest_path):
+        """Složi kopiju iz komada u `dest_path` i provjeri njen SHA-256."""
+        if snapshot_id.endswith(LEGACY_SUFFIX):
+            src = snapshot_id if os.path.exists(snapshot_id) else os.path.join(self.backup_dir, snapshot_id)
+            with gzip.open(src, "rb") as f, open(dest_path, "wb") as out:
+                shutil.copyfileobj(f, out, 1024 * 1024)
+            return
+
+        snapshot = self.read_snapshot(snapshot_id)
+        cijela = hashlib.sha256()
+        with open(dest_path, "wb") as out:
+            for digest in snapshot["chunks"]:
+                with open(self._chunk_path(digest), "rb") as f:
+                    data = zlib.decompress(f.read())
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError(f"Oštećen komad {digest}")
+                cijela.update(data)
+                out.write(data)
+        if cijela.hexdigest() != snapshot["sha256"]:
+            raise ValueError(f"Kopija {snapshot_id} nije ispravna (sha256 se ne slaže)")
+
+    def restore(self, snapshot_id):
+        """
+        Vrati kopiju u živu bazu. Ide kroz backup API u suprotnom smjeru, pa
+        ostale konekcije (workeri) nakon toga vide vraćeni sadržaj.
+        """
+        if not self.db_path:
+            raise RuntimeError("Restore radi samo za SQLite")
+        os.makedirs(self.backup_dir, exist_ok=True)
+        raw_path = os.path.join(self.backup_dir, f".restore-{os.getpid()}.raw")
+        try:
+            self.materialize(snapshot_id, raw_path)
+            src = sqlite3.connect(raw_path)
+            dst = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                if src.execute("PRAGMA integrity_check").fetchone()[0] != "ok":
+                    raise ValueError(f"Kopija {snapshot_id} ne prolazi integrity_check")
+                src.backup(dst)
+            finally:
+                dst.close()
+                src.close()
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+    def snapshots(self):
+        """Kopije iz manifesta, najnovija prva, + stari .db.gz backupi ako postoje."""
+        kopije = list(reversed(self.read_manifest().get("snapshots", [])))
+        try:
+            stari = sorted(
+                (f for f in os.listdir(self.backup_dir)
+                 if f.startswith(LEGACY_PREFIX) and f.endswith(LEGACY_SUFFIX)),
+                reverse=True,
+            )
+        except FileNotFoundError:
+            stari = []
+        return kopije, stari
+
+    # 🔹 Backup u pozadini – periodički (ako je bilo upisa) i na zahtjev
+    def start(self):
+        """Pokreni pozadinsku nit u ovom procesu (ako već ne radi)."""
+        if self._pid != os.getpid() or not (self._thread and self._thread.is_alive()):
+            self._pid = os.getpid()
+            self._thread = start_os_thread(self._worker, "backup")
+
+    def request(self):
+        self.start()
+        self._pending.set()
+
+    def _worker(self):
+        while True:
+            zatrazeno = self._pending.wait(self.interval or None)
+            # Više zahtjeva u kratkom roku spaja se u jedan backup
+            pauza = self._last_run + self.min_gap - time.monotonic()
+            if pauza > 0:
+                time.sleep(pauza)
+            self._pending.clear()
+            try:
+                # Periodički backup ne čeka drugi proces; zatraženi pričeka da ovaj završi
+                self.run(wait=zatrazeno)
+            except Exception as e:
+                print(f"⚠️ Greška u backupu: {e}")
+
+
+class _FileLock:
+    """flock na datoteci; `wait=False` odmah odustaje ako je zaključana."""
+
+    def __init__(self, path, wait=True):
+        self.path = path
+        self.wait = wait
+        self._f = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return True
+        self._f = open(self.path, "a")
+        flags = fcntl.LOCK_EX if self.wait else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(self._f, flags)
+        except BlockingIOError:
+            self._f.close()
+            self._f = None
+            return False
+        return True
+
+    def __exit__(self, *exc):
+        if self._f is not None:
+            fcntl.flock(self._f, fcntl.LOCK_UN)
+            self._f.close()
+            self._f = None
+
+
+def _read_json(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
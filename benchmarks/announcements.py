@@ -0,0 +1,161 @@
+# benchmarks/announcements.py
+"""
+Obavijest prijavljenima (bulk_mail.py) prema lokalnom SMTP sinku.
+
+Napravi privremenu bazu s jednim događajem i --recipients prijava (dio
+adresa namjerno ponovljen), pa mjeri:
+
+  1. nastavak nakon pada: proces koji šalje ubije se (SIGKILL) nakon
+     --crash-after sekundi, a drugi proces nastavlja kad lease istekne –
+     na kraju svaka adresa mora imati poruku, duplikata najviše jedna serija
+  2. propusnost: poruka u sekundi i broj SMTP konekcija
+  3. usporedbu s mail.send() po poruci (nova konekcija za svaku) na
+     --baseline primatelja
+
+Sink radi u zasebnom procesu, a --delay simulira trajanje TLS + AUTH
+handshakea po konekciji (kod pravog providera to je desetke ms).
+
+    python benchmarks/announcements.py --recipients 50000 --delay 0.05
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _sink(delay, ready, pipe):
+    from smtp_sink import SMTPSink
+
+    sink = SMTPSink(delay=delay).start()
+    ready.put(sink.port)
+    while pipe.recv() == "stats":
+        with sink._lock:
+            primatelji = [to for m in sink.messages for to in m["to"]]
+            pipe.send((len(sink.messages), sink.connections, len(set(primatelji))))
+    sink.stop()
+
+
+def _env(db_path, port, batch, rate):
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{db_path}.archive",
+        "PAGE_CACHE_BACKEND": "memory",
+        "METRICS_DIR": os.path.join(os.path.dirname(db_path), "metrics"),
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": str(port),
+        "MAIL_USE_TLS": "False",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "MAIL_BULK_BATCH": str(batch),
+        "MAIL_BULK_RATE": str(rate),
+        "MAIL_BULK_LEASE": "2",
+        "MAIL_BULK_POLL": "0",
+    })
+    os.environ.setdefault("SECRET_KEY", "bench")
+
+
+def _sender():
+    from app import create_app
+    from extensions import bulk_mailer
+
+    app = create_app()
+    with app.app_context():
+        bulk_mailer.run_pending(log=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipients", type=int, default=50000)
+    parser.add_argument("--duplicates", type=float, default=0.02, help="Udio ponovljenih adresa.")
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument("--rate", type=int, default=0, help="Poruka u minuti (0 = bez ograničenja).")
+    parser.add_argument("--delay", type=float, default=0.0, help="Kašnjenje sinka po konekciji (s).")
+    parser.add_argument("--crash-after", type=float, default=2.0, help="0 = bez testa nastavka.")
+    parser.add_argument("--baseline", type=int, default=1000)
+    args = parser.parse_args()
+
+    ready, (pipe, sink_pipe) = multiprocessing.Queue(), multiprocessing.Pipe()
+    sink = multiprocessing.Process(target=_sink, args=(args.delay, ready, sink_pipe), daemon=True)
+    sink.start()
+    port = ready.get(timeout=10)
+
+    def stats():
+        pipe.send("stats")
+        return pipe.recv()
+
+    tmp = tempfile.mkdtemp()
+    _env(os.path.join(tmp, "bench.db"), port, args.batch, args.rate)
+    from flask_mail import Message
+
+    from app import create_app
+    from extensions import bulk_mailer, db, mail
+    from models import Announcement, Event, EventRegistration
+
+    app = create_app()
+    ponovljeno = int(args.recipients * args.duplicates)
+    jedinstveno = args.recipients - ponovljeno
+    with app.app_context():
+        db.create_all()
+        event = Event(naziv="Bench događaj", broj_prijava=args.recipients)
+        db.session.add(event)
+        db.session.flush()
+        db.session.execute(EventRegistration.__table__.insert(), [
+            {"ime": f"Polaznik {i}", "email": f"p{i % jedinstveno}@example.com",
+             "event_id": event.id, "event_naziv": event.naziv}
+            for i in range(args.recipients)
+        ])
+        obavijest = bulk_mailer.create(event, "Novosti: {{ dogadaj }}", "Pozdrav {{ ime }},\n\nnovi termin je ...\n")
+        db.session.commit()
+        announcement_id = obavijest.id
+    print(f"📋 {args.recipients} prijava, {jedinstveno} različitih adresa, serija {args.batch}, "
+          f"rate {args.rate or '∞'}/min, handshake {args.delay * 1000:.0f} ms")
+
+    # 1) Pad usred slanja i nastavak
+    if args.crash_after:
+        proc = multiprocessing.Process(target=_sender)
+        proc.start()
+        proc.join(args.crash_after)
+        if proc.is_alive():
+            os.kill(proc.pid, signal.SIGKILL)
+            proc.join()
+        prije_pada = stats()[0]
+        print(f"💥 Pošiljatelj ubijen nakon {args.crash_after} s, poslano {prije_pada}")
+        time.sleep(2.1)  # MAIL_BULK_LEASE
+
+    with app.app_context():
+        t0 = time.perf_counter()
+        bulk_mailer.run_pending(log=None)
+        trajanje = time.perf_counter() - t0
+        a = db.session.get(Announcement, announcement_id)
+        status, poslano = a.status, a.sent
+    poruka, konekcija, adresa = stats()
+    nastavak = poruka - (prije_pada if args.crash_after else 0)
+    print(f"📣 Status {status}: u bazi {poslano} poslano, sink primio {poruka} poruka "
+          f"za {adresa} adresa ({poruka - adresa} duplikata), {konekcija} konekcija")
+    print(f"   nastavak: {nastavak} poruka za {trajanje:.2f} s → {nastavak / trajanje:.0f} poruka/s")
+    if adresa != jedinstveno:
+        print(f"❌ Nisu sve adrese dobile poruku ({adresa} / {jedinstveno})")
+    if poruka - adresa > args.batch:
+        print(f"❌ Više duplikata ({poruka - adresa}) nego jedna serija ({args.batch})")
+
+    # 2) Usporedba: svaka poruka svojom konekcijom (mail.send)
+    if args.baseline:
+        with app.app_context():
+            t0 = time.perf_counter()
+            for i in range(args.baseline):
+                mail.send(Message(subject="Novosti: Bench događaj", recipients=[f"b{i}@example.com"],
+                                  body=f"Pozdrav Polaznik {i},\n\nnovi termin je ...\n"))
+            baseline = args.baseline / (time.perf_counter() - t0)
+        print(f"🐢 mail.send() po poruci: {baseline:.0f} poruka/s (konekcija po poruci)")
+
+    pipe.send("stop")
+    sink.join(5)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# benchmarks/async_mode.py
+"""
+Sync vs gevent workeri uz ISTI broj procesa (= približno ista memorija).
+
+Pokreće gunicorn dvaput nad istom bazom – klasični sync workeri i
+`-k gevent` – i gađa rute koje pišu u bazu i šalju e-mail (contact,
+register_event, kontakt_snaga_uma) s `--concurrency` istovremenih klijenata.
+SMTP sink ima umjetno kašnjenje, pa pozadinsko slanje stvarno čeka mrežu.
+Za svaki način ispisuje propusnost, p50/p99 i zbroj RSS-a svih procesa
+gunicorna (master + workeri), te req/s po MB.
+
+    pip install gevent
+    python benchmarks/async_mode.py --workers 2 --concurrency 64 --requests 2000
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# benchmarks/routes.py se ne može uvesti kao "routes" (to je modul aplikacije)
+_spec = importlib.util.spec_from_file_location("bench_routes", os.path.join(ROOT, "benchmarks", "routes.py"))
+bench_routes = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bench_routes)
+
+FORM = {"ime": "Bench", "email": "bench@example.com", "poruka": "bench"}
+ROUTES = [
+    ("contact_post", "/contact"),
+    ("register_post", "/register_event/1"),
+    ("kontakt_snaga_uma", "/kontakt_snaga_uma"),
+]
+
+
+def _rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid):
+    djeca = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                djeca += [int(c) for c in f.read().split()]
+    except OSError:
+        pass
+    return djeca
+
+
+def run(mode, workers, connections, concurrency, n, env):
+    port = bench_routes._free_port()
+    cmd = [sys.executable, "-m", "gunicorn", "app:create_app()", "-b", f"127.0.0.1:{port}",
+           "-w", str(workers), "--log-level", "warning", "--backlog", "2048"]
+    if mode == "gevent":
+        cmd += ["-k", "gevent", "--worker-connections", str(connections)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    try:
+        for _ in range(100):
+            try:
+                bench_routes._request(port, "GET", "/test")
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        rezultati, rss_max = {}, 0
+        for name, path in ROUTES:
+            for _ in range(concurrency):
+                bench_routes._request(port, "POST", path, FORM)  # zagrijavanje svih workera
+            latencies, errors, lock = [], [], threading.Lock()
+            per_thread = max(1, n // concurrency)
+
+            def worker():
+                moje, greske = [], 0
+                for _ in range(per_thread):
+                    t = time.perf_counter()
+                    try:
+                        status, _cookie = bench_routes._request(port, "POST", path, FORM)
+                    except OSError:
+                        status = 599
+                    moje.append(time.perf_counter() - t)
+                    greske += status >= 400
+                with lock:
+                    latencies.extend(moje)
+                    errors.append(greske)
+
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            t0 = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            rezultati[name] = bench_routes.summarize(latencies, time.perf_counter() - t0, sum(errors))
+            rss_max = max(rss_max, sum(_rss_kb(p) for p in [proc.pid, *_children(proc.pid)]))
+            r = rezultati[name]
+            print(f"  [{mode:<6}] {name:<18} {r['throughput_rps']:8.1f} req/s, "
+                  f"p50 {r['p50_ms']:7.2f} ms, p99 {r['p99_ms']:8.2f} ms, {r['errors']} grešaka")
+        return {"routes": rezultati, "rss_mb": round(rss_max / 1024, 1)}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync vs gevent gunicorn workeri")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000, help="zahtjeva po ruti")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--connections", type=int, default=200, help="--worker-connections za gevent")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--smtp-delay", type=float, default=0.05, help="kašnjenje SMTP sinka po konekciji (s)")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args()
+
+    from smtp_sink import SMTPSink
+
+    sink = SMTPSink(delay=args.smtp_delay).start()
+    tmp = tempfile.mkdtemp(prefix="versus_async_")
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        "PAGE_CACHE_PATH": os.path.join(tmp, "cache.db"),
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'archive.db')}",
+        "BACKUP_DIR": os.path.join(tmp, "backup"),
+        "JINJA_CACHE_DIR": os.path.join(tmp, "jinja"),
+        "SECRET_KEY": "bench",
+        "MAIL_SERVER": sink.host,
+        "MAIL_PORT": str(sink.port),
+        "MAIL_USE_TLS": "False",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "MAIL_NOTIFY_TO": "admin@example.com",
+        "RATELIMIT_ENABLED": "False",
+    }
+    os.environ.update(env)
+    bench_routes.seed(args.rows, min(args.rows, 200))
+
+    print(f"{args.workers} workera, {args.concurrency} klijenata, {args.requests} zahtjeva po ruti")
+    results = {}
+    for mode in ("sync", "gevent"):
+        results[mode] = run(mode, args.workers, args.connections, args.concurrency,
+                            args.requests, dict(os.environ))
+    sink.stop()
+
+    print(f"\n  {'način':<7} {'RSS MB':>8} {'req/s (prosjek)':>15} {'req/s po MB':>12}")
+    for mode, res in results.items():
+        prosjek = sum(r["throughput_rps"] for r in res["routes"].values()) / len(res["routes"])
+        res["mean_rps"] = round(prosjek, 1)
+        print(f"  {mode:<7} {res['rss_mb']:8.1f} {prosjek:15.1f} {prosjek / res['rss_mb']:12.2f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "mails_received": len(sink.messages), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"💾 Rezultati spremljeni u {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# benchmarks/group_commit.py
+"""
+Prijave u naletu: commit po zahtjevu vs group commit (ingest.py).
+
+Jedan proces s --threads istovremenih klijenata (kao gunicorn --threads ili
+gevent worker) šalje POST /register_event/1 (s --direct zove izravno
+ingest.run() s istim poslom kao ruta – samo put do baze, bez Flaska). Svaka kombinacija
+{commit po zahtjevu, group commit} × {synchronous NORMAL, FULL} radi u
+zasebnom procesu nad novom bazom. Ispisuje prijava u sekundi, p50/p99
+trajanje zahtjeva i prosječnu veličinu serije, te provjerava da je svaka
+potvrđena prijava stvarno u bazi.
+
+    python benchmarks/group_commit.py --threads 32 --requests 100
+    python benchmarks/group_commit.py --threads 32 --requests 500 --direct
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _run(group, synchronous, threads, n_requests, direct, results):
+    tmp = tempfile.mkdtemp(prefix="versus_ingest_")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{tmp}/ingest.db",
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{tmp}/archive.db",
+        "METRICS_DIR": os.path.join(tmp, "metrics"),
+        "PAGE_CACHE_BACKEND": "memory",
+        "RATELIMIT_ENABLED": "False",
+        "MAIL_BULK_POLL": "0",
+        "SQLITE_SYNCHRONOUS": synchronous,
+        "INGEST_GROUP_COMMIT": str(group),
+        "SECRET_KEY": "bench",
+    })
+    from sqlalchemy import update
+
+    from app import create_app
+    from extensions import db, ingest, mail_queue
+    from models import Event, EventRegistration
+
+    app = create_app({"TESTING": True})  # Flask-Mail ne šalje stvarne e-mailove
+    with app.app_context():
+        db.create_all()
+        db.session.add(Event(id=1, naziv="Otvorene prijave"))
+        db.session.commit()
+
+    start = threading.Barrier(threads + 1)
+    trajanja, greske = [], []
+
+    def posao(ime, email):
+        def prijavi():
+            db.session.execute(update(Event).where(Event.id == 1).values(broj_prijava=Event.broj_prijava + 1))
+            db.session.add(EventRegistration(ime=ime, email=email, event_id=1, event_naziv="Otvorene prijave"))
+            mail_queue.enqueue(subject="Potvrda prijave", recipients=[email], body=f"Hvala {ime}")
+            return True
+        return prijavi
+
+    def klijent_direct(k):
+        with app.app_context():
+            start.wait()
+            for i in range(n_requests):
+                t0 = time.perf_counter()
+                try:
+                    ingest.run(posao(f"P {k}-{i}", f"p{k}-{i}@example.com"))
+                except Exception as e:
+                    greske.append(e)
+                    db.session.rollback()
+                trajanja.append(time.perf_counter() - t0)
+
+    def klijent(k):
+        client = app.test_client()
+        start.wait()
+        for i in range(n_requests):
+            t0 = time.perf_counter()
+            r = client.post("/register_event/1", data={"ime": f"P {k}-{i}", "email": f"p{k}-{i}@example.com"})
+            trajanja.append(time.perf_counter() - t0)
+            with client.session_transaction() as sess:
+                flashes = sess.pop("_flashes", [])
+            if r.status_code != 302 or any(cat != "success" for cat, _ in flashes):
+                greske.append(flashes)
+
+    niti = [threading.Thread(target=klijent_direct if direct else klijent, args=(k,)) for k in range(threads)]
+    for t in niti:
+        t.start()
+    start.wait()
+    t0 = time.perf_counter()
+    for t in niti:
+        t.join()
+    ukupno = time.perf_counter() - t0
+
+    from metrics import registry
+
+    with app.app_context():
+        zapisano = EventRegistration.query.count()
+        brojac = db.session.get(Event, 1).broj_prijava
+    serije = [v for (name, _), v in registry._series.items() if name == "versus_ingest_batch_size"]
+    prosjek_serije = serije[0][-2] / serije[0][-1] if serije else 1.0  # [bucketi..., zbroj, broj]
+    trajanja.sort()
+    results.put({
+        "group": group, "synchronous": synchronous, "req_s": len(trajanja) / ukupno,
+        "p50": trajanja[len(trajanja) // 2] * 1000, "p99": trajanja[int(len(trajanja) * 0.99)] * 1000,
+        "batch": prosjek_serije, "zapisano": zapisano, "brojac": brojac, "greske": len(greske),
+        "ocekivano": threads * n_requests,
+        "primjer": str(greske[0])[:300] if greske else None,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Commit po zahtjevu vs group commit")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100, help="po niti")
+    parser.add_argument("--synchronous", default="NORMAL,FULL")
+    parser.add_argument("--direct", action="store_true", help="ingest.run() bez HTTP sloja")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    ok = True
+    print(f"{'način':<22}{'sync':<8}{'prijava/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'serija':>8}")
+    for synchronous in args.synchronous.split(","):
+        for group in (False, True):
+            results = ctx.Queue()
+            p = ctx.Process(target=_run, args=(group, synchronous, args.threads, args.requests, args.direct, results))
+            p.start()
+            r = results.get()
+            p.join()
+            nacin = "group commit" if group else "commit po zahtjevu"
+            print(f"{nacin:<22}{synchronous:<8}{r['req_s']:>10.0f}{r['p50']:>9.1f}{r['p99']:>9.1f}{r['batch']:>8.1f}")
+            if r["greske"] or r["zapisano"] != r["ocekivano"] or r["brojac"] != r["zapisano"]:
+                ok = False
+                print(f"  ❌ zapisano {r['zapisano']} / {r['ocekivano']}, brojač {r['brojac']}, grešaka {r['greske']}")
+                if r["primjer"]:
+                    print(f"     npr. {r['primjer']}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/render.py
+"""
+Usporedba klasičnog (buffered) i streamanog renderiranja /courses.
+
+  buffered – svi redovi u listu, render_template() složi cijeli HTML u memoriji
+  streamed – streaming.stream_page() + data_io.iter_rows() (serije iz baze)
+
+Za svaki način mjeri se vrijeme do prvog komada (TTFB), ukupno vrijeme i
+vršna potrošnja memorije (tracemalloc, u zasebnom prolazu jer usporava).
+
+    python benchmarks/render.py --rows 20000 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FIELDS = ("id", "naziv", "opis", "cijena")
+
+
+def seed(rows):
+    from extensions import db
+    from models import Course
+
+    db.create_all()
+    batch = [{"naziv": f"Tečaj {i}", "opis": "Opis tečaja " * 8, "cijena": 100.0 + i} for i in range(rows)]
+    for i in range(0, rows, 10000):
+        db.session.execute(Course.__table__.insert(), batch[i:i + 10000])
+    db.session.commit()
+
+
+def buffered():
+    from flask import render_template
+    from extensions import db
+    from models import Course
+
+    courses = db.session.execute(db.select(*[Course.__table__.c[f] for f in FIELDS])).all()
+    yield render_template("courses.html", courses=courses)
+
+
+def streamed():
+    from data_io import iter_rows
+    from extensions import db
+    from models import Course
+    from streaming import stream_page
+
+    yield from stream_page("courses.html", courses=iter_rows(db, Course, FIELDS))
+
+
+def measure(app, variant, trace=False):
+    with app.test_request_context("/courses"):
+        if trace:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        ttfb, size = None, 0
+        for chunk in variant():
+            if ttfb is None:
+                ttfb = time.perf_counter() - t0
+            size += len(chunk)
+        total = time.perf_counter() - t0
+        peak = None
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return ttfb, total, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Buffered vs streamed render")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="versus_render_")
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'render.db')}",
+        "PAGE_CACHE_PATH": os.path.join(tmp, "cache.db"),
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'archive.db')}",
+        "JINJA_CACHE_DIR": os.path.join(tmp, "jinja"),
+        "SECRET_KEY": "render-bench",
+    })
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        seed(args.rows)
+
+    print(f"Redaka: {args.rows}, ponavljanja: {args.runs} (medijan)")
+    print(f"  {'način':<9} {'TTFB ms':>9} {'ukupno ms':>10} {'HTML MB':>8} {'vršna mem. MB':>14}")
+    for name, variant in (("buffered", buffered), ("streamed", streamed)):
+        measure(app, variant)  # zagrijavanje (prevođenje predloška, cache stranica)
+        runs = [measure(app, variant) for _ in range(args.runs)]
+        _, _, size, peak = measure(app, variant, trace=True)
+        print(f"  {name:<9} {statistics.median(r[0] for r in runs) * 1000:9.1f} "
+              f"{statistics.median(r[1] for r in runs) * 1000:10.1f} "
+              f"{size / 1e6:8.2f} {peak / 1e6:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
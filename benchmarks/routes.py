@@ -0,0 +1,347 @@
+# benchmarks/routes.py
+"""
+Benchmark ruta: propusnost i latencija (p50/p95/p99) po ruti.
+
+Napuni privremenu bazu zadanom veličinom, pa svaku javnu i admin rutu
+gađa kroz Flask test client (bez mreže) i/ili kroz pravi gunicorn proces.
+E-mailovi idu u lokalni SMTP sink. Rezultat se sprema kao JSON, pa se dva
+mjerenja mogu usporediti:
+
+    python benchmarks/routes.py --rows 100000 --mode both --out prije.json
+    python benchmarks/routes.py --rows 100000 --mode both --out poslije.json
+    python benchmarks/routes.py --compare prije.json poslije.json
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ADMIN = {"username": "bench-admin", "password": "bench-pass"}
+
+# (naziv, metoda, putanja, podaci forme, uloga)
+ROUTES = [
+    ("index", "GET", "/", None, None),
+    ("courses", "GET", "/courses", None, None),
+    ("events", "GET", "/events", None, None),
+    ("api_courses", "GET", "/api/courses", None, None),
+    ("api_ids", "GET", "/api/courses?ids=1,2,3,5,8&fields=naziv,cijena", None, None),
+    ("contact_form", "GET", "/contact", None, None),
+    ("snaga_uma", "GET", "/snaga_uma", None, None),
+    ("register_form", "GET", "/register_event/1", None, None),
+    ("register_post", "POST", "/register_event/1",
+     {"ime": "Bench", "email": "bench@example.com", "poruka": "bench"}, None),
+    ("contact_post", "POST", "/contact",
+     {"ime": "Bench", "email": "bench@example.com", "poruka": "bench"}, None),
+    ("kontakt_snaga_uma", "POST", "/kontakt_snaga_uma",
+     {"ime": "Bench", "email": "bench@example.com", "poruka": "bench"}, None),
+    ("admin_dashboard", "GET", "/admin/dashboard", None, "admin"),
+    ("messages_first", "GET", "/messages", None, "admin"),
+    ("messages_deep", "GET", "/messages?after={deep_id}", None, "admin"),
+    ("user_messages", "GET", "/user/messages", None, "user"),
+    ("export_courses", "GET", "/admin/export/courses.csv", None, "admin"),
+    ("edit_course_form", "GET", "/edit_course/1", None, "admin"),
+    ("edit_course_post", "POST", "/edit_course/1",
+     {"naziv": "Bench tečaj", "opis": "opis", "cijena": "10"}, "admin"),
+    ("add_event_form", "GET", "/add_event", None, "admin"),
+    ("edit_event_post", "POST", "/edit_event/1", {"naziv": "Bench događaj", "opis": "opis"}, "admin"),
+    ("search", "GET", "/search?q=te%C4%8Daj+12", None, None),
+    ("admin_search", "GET", "/admin/search?q=osoba12", None, "admin"),
+    ("registrations", "GET", "/admin/events/1/registrations", None, "admin"),
+    ("analytics", "GET", "/admin/analytics?dani=365", None, "admin"),
+    ("analytics_json", "GET", "/admin/analytics.json?dani=365&event_id=1", None, "admin"),
+    ("archive", "GET", "/admin/archive?izvor=contacts", None, "admin"),
+    ("archive_search", "GET", "/admin/archive?izvor=registrations&q=arhiva7@example.com", None, "admin"),
+    ("metrics", "GET", "/admin/metrics", None, "admin"),
+]
+
+
+# 🔹 Punjenje baze
+def seed(rows, catalog):
+    import analytics
+    from app import create_app
+    from commands import init_database
+    from extensions import db
+    from models import ArchivedContact, ArchivedRegistration, Course, Contact, Event, EventRegistration
+
+    app = create_app()
+    with app.app_context():
+        init_database()  # tablice, FTS indeksi i triggeri kao na produkciji
+        now = datetime.utcnow()
+
+        def bulk(model, count, make):
+            batch = []
+            for i in range(1, count + 1):
+                batch.append(make(i))
+                if len(batch) == 10000:
+                    db.session.execute(model.__table__.insert(), batch)
+                    batch = []
+            if batch:
+                db.session.execute(model.__table__.insert(), batch)
+            db.session.commit()
+
+        bulk(Course, catalog, lambda i: {"naziv": f"Tečaj {i}", "opis": "Opis tečaja " * 5, "cijena": 100.0 + i})
+        bulk(Event, catalog, lambda i: {"naziv": f"Događaj {i}", "opis": "Opis događaja " * 5})
+        bulk(Contact, rows, lambda i: {"ime": f"Osoba {i}", "email": f"osoba{i}@example.com",
+                                       "poruka": "Poruka " * 10, "datum_poruke": now - timedelta(minutes=i)})
+        bulk(EventRegistration, rows, lambda i: {
+            "ime": f"Osoba {i}", "email": f"osoba{i}@example.com", "event_id": 1, "event_naziv": "Događaj 1",
+            "poruka": "", "datum_prijave": now - timedelta(minutes=i),
+        })
+        # Arhiva (zasebna baza): pola količine, stariji datumi
+        stari = now - timedelta(days=400)
+        bulk(ArchivedContact, rows // 2, lambda i: {
+            "id": rows + i, "ime": f"Arhiva {i}", "email": f"arhiva{i}@example.com", "poruka": "Poruka " * 10,
+            "datum_poruke": stari - timedelta(minutes=i), "arhivirano": now,
+        })
+        bulk(ArchivedRegistration, rows // 2, lambda i: {
+            "id": rows + i, "ime": f"Arhiva {i}", "email": f"arhiva{i}@example.com", "event_id": 1,
+            "event_naziv": "Događaj 1", "poruka": "", "datum_prijave": stari - timedelta(minutes=i), "arhivirano": now,
+        })
+        # Skupni insert zaobilazi ORM evente – dnevni zbrojevi za analitiku iznova
+        analytics.rebuild(db)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def summarize(latencies, wall, errors=0):
+    lat = sorted(latencies)
+    return {
+        "requests": len(lat),
+        "errors": errors,
+        "throughput_rps": round(len(lat) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(lat, 50) * 1000, 2),
+        "p95_ms": round(percentile(lat, 95) * 1000, 2),
+        "p99_ms": round(percentile(lat, 99) * 1000, 2),
+        "mean_ms": round(statistics.fmean(lat) * 1000, 2) if lat else 0.0,
+    }
+
+
+# 🔹 Flask test client (u procesu, bez mreže)
+def run_test_client(routes, n, params):
+    from app import create_app
+
+    app = create_app()
+    clients = {None: app.test_client(), "admin": app.test_client(), "user": app.test_client()}
+    clients["admin"].post("/admin/login", data=ADMIN)
+    clients["user"].post("/user/login", data={"username": "admin", "password": "12345"})
+
+    rezultati = {}
+    for name, method, path, data, role in routes:
+        client, path = clients[role], path.format(**params)
+        client.open(path, method=method, data=data)  # zagrijavanje
+        latencies, errors = [], 0
+        t0 = time.perf_counter()
+        for _ in range(n):
+            t = time.perf_counter()
+            r = client.open(path, method=method, data=data)
+            r.get_data()
+            latencies.append(time.perf_counter() - t)
+            errors += r.status_code >= 400
+        rezultati[name] = summarize(latencies, time.perf_counter() - t0, errors)
+        print(f"  [client]   {name:<18} {rezultati[name]['p50_ms']:8.2f} ms p50, "
+              f"{rezultati[name]['errors']} grešaka")
+    return rezultati
+
+
+# 🔹 Pravi gunicorn proces preko HTTP-a
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _request(port, method, path, data=None, cookie=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    headers = {}
+    body = None
+    if cookie:
+        headers["Cookie"] = cookie
+    if data is not None:
+        body = urllib.parse.urlencode(data)
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+    conn.request(method, path, body=body, headers=headers)
+    resp = conn.getresponse()
+    resp.read()
+    set_cookie = resp.getheader("Set-Cookie")
+    conn.close()
+    return resp.status, set_cookie
+
+
+def _login(port, path, data):
+    _status, set_cookie = _request(port, "POST", path, data)
+    return set_cookie.split(";", 1)[0] if set_cookie else None
+
+
+def run_gunicorn(routes, n, params, workers, concurrency, env):
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app:create_app()", "-b", f"127.0.0.1:{port}",
+         "-w", str(workers), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    try:
+        for _ in range(100):
+            try:
+                _request(port, "GET", "/test")
+                break
+            except OSError:
+                time.sleep(0.1)
+        cookies = {
+            None: None,
+            "admin": _login(port, "/admin/login", ADMIN),
+            "user": _login(port, "/user/login", {"username": "admin", "password": "12345"}),
+        }
+
+        rezultati = {}
+        for name, method, path, data, role in routes:
+            path = path.format(**params)
+            _request(port, method, path, data, cookies[role])  # zagrijavanje
+            latencies, errors, lock = [], [], threading.Lock()
+            per_thread = max(1, n // concurrency)
+
+            def worker():
+                moje, greske = [], 0
+                for _ in range(per_thread):
+                    t = time.perf_counter()
+                    status, _cookie = _request(port, method, path, data, cookies[role])
+                    moje.append(time.perf_counter() - t)
+                    greske += status >= 400
+                with lock:
+                    latencies.extend(moje)
+                    errors.append(greske)
+
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            t0 = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            rezultati[name] = summarize(latencies, time.perf_counter() - t0, sum(errors))
+            print(f"  [gunicorn] {name:<18} {rezultati[name]['p50_ms']:8.2f} ms p50, "
+                  f"{rezultati[name]['throughput_rps']:8.1f} req/s, {rezultati[name]['errors']} grešaka")
+        return rezultati
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+# 🔹 Usporedba dva JSON rezultata
+def compare(path_a, path_b):
+    with open(path_a, encoding="utf-8") as f:
+        a = json.load(f)
+    with open(path_b, encoding="utf-8") as f:
+        b = json.load(f)
+    for mode in sorted(set(a["results"]) & set(b["results"])):
+        print(f"\n{mode}: {a['meta']['git']} → {b['meta']['git']}")
+        print(f"  {'ruta':<18} {'p50 prije':>10} {'p50 poslije':>12} {'req/s prije':>12} {'req/s poslije':>14}")
+        for name in a["results"][mode]:
+            if name not in b["results"][mode]:
+                continue
+            ra, rb = a["results"][mode][name], b["results"][mode][name]
+            promjena = (rb["p50_ms"] - ra["p50_ms"]) / ra["p50_ms"] * 100 if ra["p50_ms"] else 0
+            print(f"  {name:<18} {ra['p50_ms']:10.2f} {rb['p50_ms']:12.2f} "
+                  f"{ra['throughput_rps']:12.1f} {rb['throughput_rps']:14.1f}  ({promjena:+.0f}% p50)")
+
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or "?"
+    except OSError:
+        return "?"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ruta (latencija i propusnost)")
+    parser.add_argument("--rows", type=int, default=1000, help="poruka i prijava u bazi (100 – 1000000)")
+    parser.add_argument("--catalog", type=int, default=None, help="tečajeva i događaja (zadano min(rows, 200))")
+    parser.add_argument("--requests", type=int, default=200, help="zahtjeva po ruti")
+    parser.add_argument("--mode", choices=["client", "gunicorn", "both"], default="client")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--routes", default="", help="samo ove rute (zarezom odvojeno)")
+    parser.add_argument("--out", default=None)
+    parser.add_argument("--compare", nargs=2, metavar=("PRIJE", "POSLIJE"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    from smtp_sink import SMTPSink
+
+    sink = SMTPSink().start()
+    tmp = tempfile.mkdtemp(prefix="versus_bench_")
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        "PAGE_CACHE_PATH": os.path.join(tmp, "cache.db"),
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'archive.db')}",
+        "BACKUP_DIR": os.path.join(tmp, "backup"),
+        "SECRET_KEY": "bench",
+        "ADMIN_USERNAME": ADMIN["username"],
+        "ADMIN_PASSWORD": ADMIN["password"],
+        "MAIL_SERVER": sink.host,
+        "MAIL_PORT": str(sink.port),
+        "MAIL_USE_TLS": "False",
+        "MAIL_DEFAULT_SENDER": "bench@example.com",
+        "MAIL_NOTIFY_TO": "admin@example.com",
+        "RATELIMIT_ENABLED": "False",  # benchmark namjerno šalje puno POST-ova s jedne adrese
+    }
+    os.environ.update(env)
+
+    catalog = args.catalog if args.catalog is not None else min(args.rows, 200)
+    print(f"📦 Punim bazu: {args.rows} poruka/prijava, {catalog} tečajeva/događaja ...")
+    t0 = time.perf_counter()
+    seed(args.rows, catalog)
+    print(f"   gotovo za {time.perf_counter() - t0:.1f}s")
+
+    odabrane = set(filter(None, args.routes.split(",")))
+    routes = [r for r in ROUTES if not odabrane or r[0] in odabrane]
+    params = {"deep_id": max(1, args.rows // 2)}
+
+    results = {}
+    if args.mode in ("client", "both"):
+        results["client"] = run_test_client(routes, args.requests, params)
+    if args.mode in ("gunicorn", "both"):
+        results["gunicorn"] = run_gunicorn(routes, args.requests, params, args.workers,
+                                           args.concurrency, dict(os.environ))
+    sink.stop()
+
+    output = {
+        "meta": {
+            "git": _git_rev(),
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "rows": args.rows,
+            "catalog": catalog,
+            "requests": args.requests,
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "mails_received": len(sink.messages),
+        },
+        "results": results,
+    }
+    out = args.out or f"bench_routes_{output['meta']['git']}_{args.rows}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(output, f, ensure_ascii=False, indent=2)
+    print(f"💾 Rezultati spremljeni u {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/startup.py
+"""
+Mjeri koliko košta podizanje jednog workera.
+
+Svako mjerenje je novi Python proces (kao novi gunicorn worker bez --preload):
+  import     – import app modula (Flask, SQLAlchemy, modeli...)
+  create_app – izrada aplikacije (config, ekstenzije, rute)
+  first_req  – prvi zahtjev (prva konekcija na bazu, prvi render predloška)
+
+    python benchmarks/startup.py --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, %(root)r)
+import app as versus
+t1 = time.perf_counter()
+application = versus.create_app()
+t2 = time.perf_counter()
+application.test_client().get("/courses")
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "first_req": t3 - t2}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pokretanja workera")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="versus_startup_")
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+        "PAGE_CACHE_PATH": os.path.join(tmp, "cache.db"),
+        "ARCHIVE_DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'archive.db')}",
+        "SECRET_KEY": "startup-bench",
+    })
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "init-db"],
+        cwd=ROOT, env=env, check=True, capture_output=True,
+    )
+
+    mjerenja = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", CHILD % {"root": ROOT}],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        )
+        mjerenja.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"Pokretanja: {args.runs} (medijan / max, ms)")
+    for faza in ("import", "create_app", "first_req"):
+        vrijednosti = [m[faza] * 1000 for m in mjerenja]
+        print(f"  {faza:<11} {statistics.median(vrijednosti):8.1f} / {max(vrijednosti):8.1f}")
+    ukupno = [sum(m.values()) * 1000 for m in mjerenja]
+    print(f"  {'ukupno':<11} {statistics.median(ukupno):8.1f} / {max(ukupno):8.1f}")
+
+
+if __name__ == "__main__":
+    main()
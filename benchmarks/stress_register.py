@@ -0,0 +1,124 @@
+# benchmarks/stress_register.py
+"""
+Test konkurentnosti: više procesa istovremeno šalje prijave na /register_event.
+
+Svaki proces je zaseban "worker" (vlastiti engine i pool, kao pod gunicornom)
+koji radi na istoj SQLite datoteci. Na kraju se provjerava da nijedan zahtjev
+nije pao s "database is locked" i da su svi retci zapisani.
+
+S --capacity događaj ima ograničen broj mjesta: prijava smije biti točno
+toliko (ni jedna više, iako svi procesi navaljuju istovremeno), a brojač
+Event.broj_prijava mora se poklapati sa stvarnim brojem redaka.
+
+    python benchmarks/stress_register.py --procs 8 --requests 200
+    python benchmarks/stress_register.py --procs 8 --requests 200 --capacity 500
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _env(db_path):
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["ARCHIVE_DATABASE_URL"] = f"sqlite:///{db_path}.archive"
+    os.environ["PAGE_CACHE_BACKEND"] = "memory"
+    os.environ["RATELIMIT_ENABLED"] = "False"  # svi zahtjevi dolaze s iste adrese
+    os.environ.setdefault("SECRET_KEY", "stress-test")
+
+
+def _worker(db_path, n_requests, start, results):
+    try:
+        _hammer(db_path, n_requests, start, results)
+    except Exception:
+        results.put((n_requests, 0.0))  # roditelj ne smije čekati zauvijek
+        raise
+
+
+def _hammer(db_path, n_requests, start, results):
+    _env(db_path)
+    from app import create_app
+
+    app = create_app({"TESTING": True})  # Flask-Mail ne šalje stvarne e-mailove
+    client = app.test_client()
+    start.wait()
+
+    greske = 0
+    t0 = time.perf_counter()
+    for i in range(n_requests):
+        r = client.post(
+            "/register_event/1",
+            data={"ime": f"Test {os.getpid()}-{i}", "email": f"t{os.getpid()}-{i}@example.com"},
+        )
+        with client.session_transaction() as sess:
+            flashes = sess.pop("_flashes", [])
+        if r.status_code != 302 or any(cat == "danger" for cat, _ in flashes):
+            greske += 1
+    results.put((greske, time.perf_counter() - t0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stres test prijava na događaj")
+    parser.add_argument("--procs", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--capacity", type=int, default=None, help="kapacitet događaja")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="versus_stress_")
+    db_path = os.path.join(tmp, "stress.db")
+    _env(db_path)
+    from app import create_app
+    from extensions import db
+    from models import Event, EventRegistration
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.session.add(Event(id=1, naziv="Python Osnove", kapacitet=args.capacity))
+        db.session.commit()
+
+    ctx = multiprocessing.get_context("spawn")
+    start, results = ctx.Event(), ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(db_path, args.requests, start, results))
+        for _ in range(args.procs)
+    ]
+    for p in procs:
+        p.start()
+    time.sleep(1)  # neka se svi procesi podignu prije starta
+    t0 = time.perf_counter()
+    start.set()
+
+    ukupno_gresaka = 0
+    for _ in procs:
+        greske, _trajanje = results.get()
+        ukupno_gresaka += greske
+    for p in procs:
+        p.join()
+    trajanje = time.perf_counter() - t0
+
+    with app.app_context():
+        zapisano = EventRegistration.query.count()
+        brojac = db.session.get(Event, 1).broj_prijava
+    ocekivano = args.procs * args.requests
+    if args.capacity is not None:
+        ocekivano_zapisa = min(ocekivano, args.capacity)
+    else:
+        ocekivano_zapisa = ocekivano
+
+    print(f"Procesa: {args.procs}, zahtjeva: {ocekivano}, trajanje: {trajanje:.2f}s "
+          f"({ocekivano / trajanje:.0f} req/s)")
+    print(f"Zapisano prijava: {zapisano} (brojač: {brojac}), neuspjelih zahtjeva: {ukupno_gresaka}")
+    if ukupno_gresaka or zapisano != ocekivano_zapisa or brojac != zapisano:
+        print("❌ Test konkurentnosti NIJE prošao")
+        sys.exit(1)
+    print("✅ Test konkurentnosti prošao")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# bulk_mail.py
+"""
+Obavijesti svima prijavljenima na događaj (admin → Prijave → 📣 Obavijest).
+
+Obavijest je redak u tablici `announcement`; predmet i tekst su Jinja
+predlošci s varijablama {{ ime }}, {{ email }} i {{ dogadaj }}. Šalje je
+pozadinska nit (ili `flask send-announcements`):
+
+  - primatelji se čitaju u serijama od MAIL_BULK_BATCH (keyset po id-u
+    prijave, samo ime i e-mail), a cijela serija ide kroz JEDNU SMTP
+    konekciju s jednom prijavom na server (mail.connect())
+  - najviše MAIL_BULK_RATE poruka u minuti (0 = bez ograničenja), ravnomjerno
+    razmaknutih, pa ni kratki nalet ne prijeđe limit providera
+  - nakon svake serije u bazu se zapisuje id zadnje obrađene prijave; nakon
+    pada ili restarta slanje se nastavlja od tog mjesta (ponovno može otići
+    najviše jedna serija)
+  - obavijest drži onaj tko ju je preuzeo (lease); ako worker umre, lease
+    istekne i slanje preuzima drugi worker
+
+Ista adresa prijavljena više puta dobiva jednu poruku.
+"""
+import os
+import smtplib
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask_mail import BadHeaderError, Message
+from jinja2 import StrictUndefined, TemplateError
+from jinja2.sandbox import SandboxedEnvironment
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.orm import aliased
+
+from concurrency import write_transaction
+from metrics import registry
+
+ACTIVE = ("pending", "sending")
+
+# Greške jedne poruke (adresa odbijena...) – serija se nastavlja
+_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+    BadHeaderError,
+)
+
+
+def email_key(column):
+    """Adresa kako se uspoređuje za "ista osoba" (indeks ix_event_registration_email)."""
+    return func.lower(func.trim(column))
+
+
+# Predlošci obavijesti dolaze iz forme – bez pristupa configu i objektima aplikacije
+_templates = SandboxedEnvironment(autoescape=False, undefined=StrictUndefined)
+
+
+def compile_templates(subject, body):
+    """(predmet, tekst) kao Jinja predlošci; ValueError ako ne valjaju."""
+    try:
+        predlosci = _templates.from_string(subject), _templates.from_string(body)
+        primjer = {"ime": "Ana", "email": "ana@example.com", "dogadaj": "Događaj"}
+        for predlozak in predlosci:
+            predlozak.render(primjer)
+    except TemplateError as e:
+        raise ValueError(f"Neispravan predložak: {e}") from None
+    return predlosci
+
+
+class _Pacer:
+    """Razmak između poruka za `rate` poruka u minuti (0 = bez ograničenja)."""
+
+    def __init__(self, rate):
+        self.interval = 60.0 / rate if rate else 0.0
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_at > now:
+            time.sleep(self.next_at - now)
+        self.next_at = max(self.next_at, now) + self.interval
+
+
+class BulkMailer:
+    def __init__(self, app, db, mail, model, registration_model):
+        self.app = app
+        self.db = db
+        self.mail = mail
+        self.model = model
+        self.registrations = registration_model
+
+        self.batch_size = app.config.get("MAIL_BULK_BATCH", 100)
+        self.rate = app.config.get("MAIL_BULK_RATE", 120)
+        self.poll = app.config.get("MAIL_BULK_POLL", 30)
+        self.max_attempts = app.config.get("MAIL_QUEUE_MAX_ATTEMPTS", 6)
+        self.backoff = app.config.get("MAIL_QUEUE_BACKOFF", 30)
+        # Lease mora pokriti najsporiju seriju (obnavlja se nakon svake)
+        trajanje_serije = self.batch_size * 60.0 / self.rate if self.rate else 0
+        self.lease = max(app.config.get("MAIL_BULK_LEASE", 300), 2 * trajanje_serije)
+
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    # 🔹 Nova obavijest (bez commita – commit radi ruta)
+    def create(self, event, subject, body):
+        compile_templates(subject, body)
+        R = self.registrations
+        ukupno = self.db.session.execute(
+            select(func.count(func.distinct(email_key(R.email)))).where(R.event_id == event.id)
+        ).scalar()
+        row = self.model(event_id=event.id, event_naziv=event.naziv, subject=subject, body=body, total=ukupno)
+        self.db.session.add(row)
+        return row
+
+    def cancel(self, announcement_id):
+        return self._set_status(announcement_id, ACTIVE, status="cancelled", owner=None)
+
+    def resume(self, announcement_id):
+        return self._set_status(announcement_id, ("failed", "cancelled"),
+                                status="pending", attempts=0, lease_until=None, last_error=None)
+
+    def _set_status(self, announcement_id, iz, **values):
+        A = self.model
+
+        def promijeni():
+            n = self.db.session.execute(
+                update(A).where(A.id == announcement_id, A.status.in_(iz)).values(**values)
+            ).rowcount
+            self.db.session.commit()
+            return n
+
+        return bool(write_transaction(self.db, promijeni))
+
+    # 🔹 Pozadinska nit (jedna po workeru; koji worker šalje, odlučuje lease)
+    def start(self):
+        if not self.poll:
+            return  # slanje samo preko `flask send-announcements`
+        if self._pid != os.getpid() or not (self._thread and self._thread.is_alive()):
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="bulk-mail", daemon=True)
+            self._thread.start()
+
+    def notify(self):
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    poslano = self.send_next()
+            except Exception as e:
+                print(f"⚠️ Greška pri slanju obavijesti: {e}")
+                poslano = None
+            if poslano is None:
+                self._wake.wait(self.poll)
+                self._wake.clear()
+
+    # 🔹 Sinkrono (CLI, benchmark): šalji dok ima obavijesti koje nitko drugi ne drži
+    def run_pending(self, log=print):
+        ukupno = 0
+        with self.app.app_context():
+            while True:
+                poslano = self.send_next(log)
+                if poslano is None:
+                    return ukupno
+                ukupno += poslano
+
+    def send_next(self, log=None):
+        """Preuzmi najstariju aktivnu obavijest i šalji je; None ako nema što preuzeti."""
+        announcement_id = self._claim()
+        if announcement_id is None:
+            return None
+        try:
+            return self._send(announcement_id, log)
+        except Exception as e:
+            self._failed(announcement_id, e)
+            raise
+
+    def _owner(self):
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def _claim(self):
+        # Uvijek samo najstarija aktivna: dvije obavijesti nikad ne idu paralelno
+        # (limit providera je jedan za sve)
+        A = self.model
+        now = datetime.utcnow()
+        kandidat = self.db.session.execute(
+            select(A.id, A.lease_until).where(A.status.in_(ACTIVE)).order_by(A.id).limit(1)
+        ).first()
+        self.db.session.rollback()
+        if kandidat is None or (kandidat.lease_until and kandidat.lease_until > now):
+            return None
+
+        def preuzmi():
+            n = self.db.session.execute(
+                update(A)
+                .where(A.id == kandidat.id, A.status.in_(ACTIVE))
+                .where(or_(A.lease_until.is_(None), A.lease_until <= now))
+                .values(
+                    status="sending",
+                    owner=self._owner(),
+                    lease_until=now + timedelta(seconds=self.lease),
+                    started_at=func.coalesce(A.started_at, now),
+                )
+            ).rowcount
+            self.db.session.commit()
+            return n
+
+        return kandidat.id if write_transaction(self.db, preuzmi) else None
+
+    def _send(self, announcement_id, log=None):
+        A, R = self.model, self.registrations
+        a = self.db.session.get(A, announcement_id)
+        subject_t, body_t = compile_templates(a.subject, a.body)
+        event_id, cursor, dogadaj = a.event_id, a.last_registration_id, a.event_naziv
+        if event_id is None:  # događaj je obrisan (prijave više nisu vezane uz njega)
+            self._save(announcement_id, cursor, 0, 0, None, done=True)
+            return 0
+        # Prijava čija je adresa već prijavljena ranije (manji id) ne dobiva
+        # drugu poruku – provjera je u bazi (indeks), bez skupa adresa u memoriji
+        R2 = aliased(R)
+        duplikat = exists().where(
+            R2.event_id == R.event_id, email_key(R2.email) == email_key(R.email), R2.id < R.id
+        )
+
+        pacer = _Pacer(self.rate)
+        ukupno = 0
+        while True:
+            serija = self.db.session.execute(
+                select(R.id, R.ime, R.email)
+                .where(R.event_id == event_id, R.id > cursor, ~duplikat)
+                .order_by(R.id)
+                .limit(self.batch_size)
+            ).all()
+            self.db.session.rollback()
+            if not serija:
+                self._save(announcement_id, cursor, 0, 0, None, done=True)
+                return ukupno
+
+            poslano, neuspjelo, greska = 0, 0, None
+            try:
+                with self.mail.connect() as conn:
+                    for r in serija:
+                        kontekst = {"ime": r.ime, "email": r.email, "dogadaj": dogadaj}
+                        msg = Message(
+                            subject=" ".join(subject_t.render(kontekst).split()),
+                            recipients=[r.email],
+                            body=body_t.render(kontekst),
+                        )
+                        pacer.wait()
+                        try:
+                            conn.send(msg)
+                            poslano += 1
+                        except _MESSAGE_ERRORS as e:
+                            neuspjelo += 1
+                            greska = f"{r.email}: {e}"[:500]
+                        cursor = r.id
+            finally:
+                # I kad konekcija pukne usred serije, obrađeni primatelji se pamte
+                nastavi = self._save(announcement_id, cursor, poslano, neuspjelo, greska)
+                registry.inc("versus_mail_bulk_sent_total", poslano, result="sent")
+                registry.inc("versus_mail_bulk_sent_total", neuspjelo, result="error")
+                registry.flush()
+            ukupno += poslano
+            if log:
+                log(f"  📣 #{announcement_id}: poslano {ukupno} (prijava do id {cursor})")
+            if not nastavi:
+                return ukupno  # otkazano ili ju je preuzeo drugi worker
+
+    def _save(self, announcement_id, cursor, poslano, neuspjelo, greska, done=False):
+        """Zapiši napredak i produlji lease; False ako obavijest više nije naša."""
+        A = self.model
+        now = datetime.utcnow()
+        values = {
+            "last_registration_id": cursor,
+            "sent": A.sent + poslano,
+            "failed": A.failed + neuspjelo,
+            "lease_until": now + timedelta(seconds=self.lease),
+        }
+        if poslano + neuspjelo:
+            # Server je radio – brojač neuspjelih pokušaja (_failed) kreće iznova
+            values["attempts"] = 0
+        if greska:
+            values["last_error"] = greska
+        if done:
+            values.update(status="done", finished_at=now, owner=None, lease_until=None)
+
+        def zapisi():
+            n = self.db.session.execute(
+                update(A)
+                .where(A.id == announcement_id, A.status == "sending", A.owner == self._owner())
+                .values(**values)
+            ).rowcount
+            self.db.session.commit()
+            return n
+
+        return bool(write_transaction(self.db, zapisi))
+
+    def _failed(self, announcement_id, error):
+        # Konekcija/server: pokušaj ponovno nakon backoffa (lease = vrijeme čekanja)
+        A = self.model
+        self.db.session.rollback()
+        a = self.db.session.get(A, announcement_id)
+        if a is None or a.status != "sending" or a.owner != self._owner():
+            return
+        a.attempts += 1
+        a.last_error = str(error)[:500]
+        a.owner = None
+        if a.attempts >= self.max_attempts:
+            a.status = "failed"
+            a.lease_until = None
+            print(f"⚠️ Obavijest #{a.id} zaustavljena nakon {a.attempts} pokušaja: {error}")
+        else:
+            a.lease_until = datetime.utcnow() + timedelta(seconds=self.backoff * 2 ** (a.attempts - 1))
+        self.db.session.commit()
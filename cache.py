@@ -0,0 +1,134 @@
+# cache.py
+"""
+Cache za renderirane stranice i rezultate upita (/courses, /events).
+
+Dva backenda:
+  - LRUCache    – u memoriji procesa (razvoj, jedan worker)
+  - SQLiteCache – jedna datoteka koju dijele svi gunicorn workeri
+
+Nema isteka po vremenu: zapisi vrijede dok ih rute koje mijenjaju podatke
+eksplicitno ne ponište preko PageCache.invalidate("courses") i sl. Oba
+backenda drže najviše PAGE_CACHE_MAX_ENTRIES zapisa (najstariji izlaze prvi).
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from concurrency import retry_locked, sqlite_busy_timeout, thread_local
+
+
+class LRUCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+
+class SQLiteCache:
+    def __init__(self, path, maxsize=1000):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = thread_local()
+
+    def _conn(self):
+        # Posebna konekcija po (OS) niti i po procesu (nakon forka ne dijelimo konekcije)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=sqlite_busy_timeout() / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    # Upisi čekaju lock kroz retry_locked (pod gevent-om kooperativno, vidi concurrency.py)
+    def set(self, key, value):
+        conn = self._conn()
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        retry_locked(lambda: conn.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, data)))
+        if not key.startswith("gen:"):
+            # REPLACE daje novi rowid, pa je rowid redoslijed upisa; generacije ostaju
+            retry_locked(lambda: conn.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache WHERE key NOT GLOB 'gen:*' "
+                "ORDER BY rowid DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            ))
+
+    def delete_prefix(self, prefix):
+        conn = self._conn()
+        retry_locked(lambda: conn.execute(
+            "DELETE FROM cache WHERE key >= ? AND key < ?", (prefix, prefix + "\uffff")
+        ))
+
+
+class PageCache:
+    """
+    Svaki namespace ("courses", "events") ima svoju generaciju. Ključevi u
+    sebi nose generaciju pročitanu PRIJE upita u bazu, pa worker koji je
+    renderirao stare podatke ne može ih spremiti pod novu generaciju.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def lookup(self, namespace, key):
+        """(vrijednost ili None, puni ključ). Puni ključ se kasnije predaje u store()."""
+        gen = self.backend.get("gen:" + namespace) or 0
+        full_key = f"{namespace}:{gen}:{key}"
+        return self.backend.get(full_key), full_key
+
+    def store(self, full_key, value):
+        try:
+            self.backend.set(full_key, value)
+        except Exception as e:
+            print(f"⚠️ Greška u cacheu: {e}")
+
+    def get_or_set(self, namespace, key, builder):
+        # Cache nikad ne smije srušiti stranicu – kod greške samo renderiraj
+        try:
+            value, full_key = self.lookup(namespace, key)
+        except Exception as e:
+            print(f"⚠️ Greška u cacheu: {e}")
+            return builder()
+        if value is None:
+            value = builder()
+            self.store(full_key, value)
+        return value
+
+    def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            self.backend.set("gen:" + namespace, time.time_ns())
+            self.backend.delete_prefix(namespace + ":")
+
+
+def make_cache(backend, path=None, maxsize=1000):
+    if backend == "sqlite":
+        return PageCache(SQLiteCache(path, maxsize))
+    return PageCache(LRUCache(maxsize))
@@ -0,0 +1,242 @@
+# commands.py
+"""
+CLI naredbe: flask init-db, send-mail, send-announcements, analytics-rebuild, export, import,
+build-assets, backup, restore-backup, archive, sql-report.
+"""
+import os
+import sys
+
+import click
+from flask.cli import with_appcontext
+
+from extensions import db, mail_queue, bulk_mailer, page_cache, backup_manager
+
+
+def init_database():
+    """Tablice, migracije, pretraga i prvi izračun analitike (`flask init-db`, init_db.py)."""
+    from sqlalchemy import select
+
+    import analytics
+    import migrations
+    import models  # registrira modele na db.metadata
+    import search
+
+    db.create_all()
+    migrations.upgrade(db)
+    search.install(db)
+    if db.session.execute(select(models.DailyStat.dan).limit(1)).first() is None:
+        # Prvi deploy analitike na postojeću bazu: zbrojevi iz dosadašnjih redaka
+        analytics.rebuild(db)
+
+
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """Kreiraj tablice koje još ne postoje (postojeće podatke ne dira)."""
+    init_database()
+    print("✅ Baza podataka je spremna.")
+
+
+@click.command("send-mail")
+@with_appcontext
+def send_mail_command():
+    """Odmah pošalji sve e-mailove koji čekaju u redu."""
+    print(f"📨 Poslano: {mail_queue.flush()}")
+
+
+@click.command("send-announcements")
+@with_appcontext
+def send_announcements_command():
+    """Pošalji (ili nastavi slati) obavijesti prijavljenima koje nitko drugi ne šalje."""
+    print(f"📣 Poslano: {bulk_mailer.run_pending()}")
+
+
+@click.command("analytics-rebuild")
+@with_appcontext
+def analytics_rebuild_command():
+    """Iznova izračunaj dnevne zbrojeve za analitiku iz vruće baze i arhive."""
+    import analytics
+
+    obradeno = analytics.rebuild(db)
+    print("📊 Obrađeno: " + ", ".join(f"{k} {v}" for k, v in obradeno.items()))
+
+
+@click.command("export")
+@click.argument("table", type=click.Choice(["contacts", "courses", "events", "registrations"]))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default="csv")
+@click.option("--output", type=click.File("w", encoding="utf-8"), default="-")
+@with_appcontext
+def export_command(table, fmt, output):
+    """Izvezi tablicu u CSV ili JSONL (streaming, bez učitavanja u memoriju)."""
+    from data_io import export_csv, export_jsonl
+    from routes import EXPORTS
+
+    model, fields = EXPORTS[table]
+    generator = export_csv if fmt == "csv" else export_jsonl
+    for chunk in generator(db, model, fields):
+        output.write(chunk)
+
+
+@click.command("import")
+@click.argument("table", type=click.Choice(["courses", "events"]))
+@click.argument("source", type=click.File("r", encoding="utf-8-sig"))
+@click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default=None)
+@with_appcontext
+def import_command(table, source, fmt):
+    """Skupni uvoz tečajeva ili događaja iz CSV/JSONL datoteke."""
+    from data_io import read_records
+    from routes import import_records
+
+    fmt = fmt or ("jsonl" if source.name.endswith((".jsonl", ".json")) else "csv")
+    uvezeno, greske = import_records(table, read_records(source, fmt))
+    for greska in greske:
+        print(f"⚠️ {greska}", file=sys.stderr)
+    print(f"✅ Uvezeno zapisa: {uvezeno}")
+
+
+@click.command("build-assets")
+@click.option("--no-fetch", is_flag=True, help="Ne preuzimaj Bootstrap (koristi samo static/vendor/).")
+@click.option("--clean", is_flag=True, help="Obriši datoteke starijih buildova iz static/dist/.")
+@with_appcontext
+def build_assets_command(no_fetch, clean):
+    """Hashiraj i komprimiraj statičke datoteke u static/dist/ (+ manifest.json)."""
+    import assets
+    from flask import current_app
+
+    out_dir = current_app.config["ASSETS_DIR"]
+    manifest = assets.build(current_app.static_folder, out_dir, fetch=not no_fetch)
+    if clean:
+        assets.clean(out_dir, manifest)
+
+    # Keširane stranice sadrže stara hashirana imena
+    for namespace in ("courses", "events"):
+        page_cache.invalidate(namespace)
+    print(f"✅ Datoteka u manifestu: {len(manifest['files'])}")
+
+
+@click.command("backup")
+@click.option("--force", is_flag=True, help="Napravi kopiju i ako se baza nije mijenjala.")
+@with_appcontext
+def backup_command(force):
+    """Napravi backup odmah (npr. iz crona) i primijeni retenciju."""
+    snapshot_id = backup_manager.run(force=force)
+    print(f"✅ Nova kopija: {snapshot_id}" if snapshot_id else "ℹ️ Nema promjena od zadnjeg backupa.")
+
+
+@click.command("restore-backup")
+@click.argument("snapshot", required=False)
+@click.option("--list", "list_only", is_flag=True, help="Samo ispiši dostupne kopije.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Složi kopiju u datoteku umjesto u bazu.")
+@click.option("--yes", is_flag=True, help="Ne pitaj za potvrdu.")
+@with_appcontext
+def restore_backup_command(snapshot, list_only, output, yes):
+    """Vrati bazu iz kopije (id iz manifesta ili stari versus_backup_*.db.gz)."""
+    from counters import bump_version
+    from models import TableVersion, VERSIONED_MODELS
+
+    kopije, stari = backup_manager.snapshots()
+    if list_only or not snapshot:
+        for k in kopije:
+            print(f"{k['id']}  {k['created'].replace('T', ' ')}  {k['size'] / 1048576:8.2f} MB")
+        for name in stari:
+            print(f"{name}  (stari format)")
+        if not kopije and not stari:
+            print("Nema dostupnih kopija.")
+        return
+
+    if output:
+        backup_manager.materialize(snapshot, output)
+        print(f"✅ Kopija {snapshot} složena u {output}")
+        return
+
+    if not yes:
+        click.confirm(f"Baza će biti zamijenjena kopijom {snapshot}. Nastaviti?", abort=True)
+    backup_manager.restore(snapshot)
+
+    # Vraćene verzije tablica su starije od onih koje su klijenti već vidjeli (ETag)
+    for name in VERSIONED_MODELS:
+        bump_version(db, TableVersion, name)
+    db.session.commit()
+    for namespace in ("courses", "events"):
+        page_cache.invalidate(namespace)
+    print(f"✅ Baza vraćena iz kopije {snapshot}")
+
+
+@click.command("archive")
+@click.option("--older-than", type=int, default=None, help="Dana (zadano ARCHIVE_AFTER_DAYS).")
+@click.option("--batch", type=int, default=None, help="Redaka po transakciji (zadano ARCHIVE_BATCH).")
+@click.option("--vacuum", is_flag=True, help="Nakon arhiviranja smanji datoteku baze (VACUUM).")
+@with_appcontext
+def archive_command(older_than, batch, vacuum):
+    """Preseli stare poruke i prijave u arhivsku bazu."""
+    from flask import current_app
+    from sqlalchemy.engine import make_url
+
+    import archive
+    from backup import BackupManager
+
+    cfg = current_app.config
+    dana = older_than if older_than is not None else cfg["ARCHIVE_AFTER_DAYS"]
+    print(f"🗄️ Arhiviram retke starije od {dana} dana ...")
+    preseljeno = archive.archive_old(db, dana, batch or cfg["ARCHIVE_BATCH"])
+    print("✅ Preseljeno: " + ", ".join(f"{k} {v}" for k, v in preseljeno.items()))
+    if not any(preseljeno.values()):
+        return
+
+    # Arhiva sad ima podatke kojih više nema u backupima vruće baze
+    url = db.engines["archive"].url
+    if url.get_backend_name() == "sqlite" and url.database:
+        BackupManager(
+            db_path=url.database,
+            backup_dir=os.path.join(cfg["BACKUP_DIR"], "archive"),
+            keep=cfg["BACKUP_KEEP"],
+            hourly=0,
+            daily=cfg["BACKUP_KEEP_DAILY"],
+            weekly=cfg["BACKUP_KEEP_WEEKLY"],
+            chunk_size=cfg["BACKUP_CHUNK_KB"] * 1024,
+        ).run()
+
+    if vacuum and make_url(cfg["SQLALCHEMY_DATABASE_URI"]).get_backend_name() == "sqlite":
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM")
+        print("🧹 VACUUM gotov.")
+
+
+@click.command("sql-report")
+@click.option("--log", "log_path", type=click.Path(dir_okay=False), default=None, help="Zadano SQL_PROFILE_LOG.")
+@click.option("--endpoint", default=None, help="Samo jedan endpoint (npr. main.courses).")
+@click.option("--top", type=int, default=10, help="Koliko upita ispisati po endpointu.")
+@click.option("--sort", type=click.Choice(["total", "count", "max"]), default="total")
+@with_appcontext
+def sql_report_command(log_path, endpoint, top, sort):
+    """Sažmi log SQL profilera po endpointu i upitu."""
+    from flask import current_app
+
+    import sqlprofile
+
+    log_path = log_path or current_app.config["SQL_PROFILE_LOG"]
+    if not os.path.exists(log_path):
+        print(f"⚠️ {log_path} ne postoji – pokreni aplikaciju sa SQL_PROFILE=True.")
+        return
+    po_endpointu, po_otisku, tekst = sqlprofile.report(log_path, endpoint)
+    kljuc = {"total": "ms", "count": "count", "max": "max_ms"}[sort]
+
+    for ep, e in sorted(po_endpointu.items(), key=lambda kv: -kv[1]["ms"]):
+        zahtjeva = e["requests"] or 1
+        print(f"\n🔹 {ep}: {e['requests']} zahtjeva, {e['queries'] / zahtjeva:.1f} upita/zahtjev, "
+              f"{e['ms']:.1f} ms ukupno, sporih {e['slow']}, N+1 {e['nplus1']}")
+        upiti = sorted(((fp, s) for (ep2, fp), s in po_otisku.items() if ep2 == ep), key=lambda kv: -kv[1][kljuc])
+        for fp, s in upiti[:top]:
+            oznake = ("  ⚠️FULL SCAN" if s["full_scan"] else "") + ("  ⚠️N+1" if s["nplus1"] else "")
+            prosjek = s["ms"] / s["count"] if s["count"] else 0
+            sql = tekst.get(fp, "?")
+            print(f"  {fp}  {s['count']:>6}×  {s['ms']:>9.1f} ms  prosj. {prosjek:.2f}  max {s['max_ms']:.2f}"
+                  f"  sporih {s['slow']}{oznake}")
+            print(f"      {sql[:160]}{'…' if len(sql) > 160 else ''}")
+
+
+COMMANDS = [
+    init_db_command, send_mail_command, send_announcements_command, analytics_rebuild_command,
+    export_command, import_command, build_assets_command, backup_command, restore_backup_command,
+    archive_command, sql_report_command,
+]
@@ -0,0 +1,118 @@
+# concurrency.py
+"""
+Podrška za gevent workere (gunicorn -k gevent).
+
+Gevent worker monkey-patcha socket, time.sleep, threading... pa jedan proces
+poslužuje stotine istovremenih zahtjeva u greenletima. Kod koji samo čeka
+mrežu (SMTP, Postgres s psycopg 3) time automatski postaje neblokirajući.
+SQLite je iznimka: C biblioteka čeka lock bez znanja gevent huba, pa bi
+jedan pisac koji čeka busy_timeout zaustavio SVE zahtjeve u procesu.
+
+Zato u gevent načinu:
+  - busy_timeout konekcije je kratak (SQLITE_BUSY_TIMEOUT_GEVENT, ms),
+  - rute koje pišu koriste write_transaction(): na "database is locked"
+    rollback, kooperativno spavanje (drugi greenleti rade) i novi pokušaj,
+  - vlastite sqlite konekcije (cache, rate limiter) imaju isti kratki
+    busy_timeout i ponavljaju upis kroz retry_locked(); drže se po OS niti, a
+    ne po greenletu (inače bi svaki zahtjev otvarao novu konekciju),
+  - dugi CPU/C posao (backup) radi u pravoj OS niti (start_os_thread), inače
+    bi kao greenlet zaustavio event loop do kraja kopiranja.
+
+Bez gevent-a sve se ponaša kao i prije.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from sqlalchemy.exc import OperationalError
+
+
+def gevent_active():
+    """True ako je proces monkey-patchan (gunicorn -k gevent)."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+
+def os_threading(name):
+    """threading.<name> (Thread, Lock, Event...) kakav je bio prije monkey-patchanja."""
+    if gevent_active():
+        from gevent import monkey
+
+        return monkey.get_original("threading", name)
+    return getattr(threading, name)
+
+
+class _PoolThread:
+    def __init__(self, result):
+        self._result = result
+
+    def is_alive(self):
+        return not self._result.ready()
+
+
+def start_os_thread(target, name):
+    """
+    Pokreni `target` u pravoj OS niti; vraća objekt s is_alive(). Pod gevent-om
+    i originalni threading.Thread pokreće greenlet (patchan je _start_new_thread),
+    pa posao ide u threadpool huba.
+    """
+    if gevent_active():
+        import gevent
+
+        return _PoolThread(gevent.get_hub().threadpool.spawn(target))
+    nit = threading.Thread(target=target, name=name, daemon=True)
+    nit.start()
+    return nit
+
+
+def thread_local():
+    """threading.local po OS niti i kad je threading patchan (tada bi bio po greenletu)."""
+    return os_threading("local")()
+
+
+def sqlite_busy_timeout():
+    """busy_timeout (ms) za konekcije aplikacije."""
+    if gevent_active():
+        return int(os.getenv("SQLITE_BUSY_TIMEOUT_GEVENT", 20))
+    return int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000))
+
+
+def locked_error(error):
+    """True za SQLite "database is locked" / "busy" (vrijedi ponoviti)."""
+    poruka = str(getattr(error, "orig", error)).lower()
+    return "locked" in poruka or "busy" in poruka
+
+
+def retry_locked(work, rollback=None, timeout=None):
+    """
+    Izvrši `work()` i ponovi ga dok baza javlja "locked"/"busy" (najdulje
+    SQLITE_BUSY_TIMEOUT). Vrijedi i za SQLAlchemy i za izravne sqlite3
+    konekcije (cache, rate limiter). Čekanje je time.sleep, pod gevent-om
+    kooperativno. `rollback()` se zove nakon svake OperationalError.
+    """
+    if timeout is None:
+        timeout = int(os.getenv("SQLITE_BUSY_TIMEOUT", 5000)) / 1000
+    rok = time.monotonic() + timeout
+    pauza = 0.002
+    while True:
+        try:
+            return work()
+        except (OperationalError, sqlite3.OperationalError) as e:
+            if rollback is not None:
+                rollback()
+            if not locked_error(e) or time.monotonic() + pauza > rok:
+                raise
+        time.sleep(pauza)
+        pauza = min(pauza * 2, 0.05)
+
+
+def write_transaction(db, work, timeout=None):
+    """
+    Izvrši `work()` (dodaje/mijenja retke i commita) i ponovi ga ako je baza
+    zaključana. `work` mora biti ponovljiv – sve objekte stvara sam.
+    """
+    return retry_locked(work, rollback=db.session.rollback, timeout=timeout)
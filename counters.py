@@ -0,0 +1,144 @@
+# counters.py
+"""
+Brojači redaka koje održavaju ORM eventi (after_insert / after_delete).
+
+COUNT(*) u SQLite-u uvijek prođe cijeli indeks, pa dashboard s više tablica
+postaje sve sporiji kako baza raste. Ovdje se broj redaka drži u maloj
+tablici `table_counter` i mijenja u ISTOJ transakciji kao i sam zapis,
+a dashboard sve brojače čita jednim upitom.
+
+Dnevni zbrojevi za analitiku (`daily_stat`, vidi analytics.py) također se
+mijenjaju u istoj transakciji kao i zapis koji broje.
+
+Isti princip vrijedi za verzije tablica (`table_version`): svaki insert,
+update i delete poveća verziju i zapiše vrijeme promjene. Iz toga rute
+grade ETag / Last-Modified bez ijednog upita nad samim podacima.
+"""
+from datetime import datetime
+
+from sqlalchemy import event, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+
+def track_counts(counter_model, models):
+    """Zakači brojače na modele: {"course": Course, ...}."""
+    table = counter_model.__table__
+
+    def make_listener(name, delta):
+        def listener(mapper, connection, target):
+            connection.execute(
+                update(table)
+                .where(table.c.name == name)
+                .values(count=table.c.count + delta)
+            )
+        return listener
+
+    for name, model in models.items():
+        event.listen(model, "after_insert", make_listener(name, 1))
+        event.listen(model, "after_delete", make_listener(name, -1))
+
+
+def read_counts(db, counter_model, models):
+    """Svi brojači u jednom upitu; brojač koji još ne postoji inicijalizira se jednom."""
+    table = counter_model.__table__
+    counts = dict(db.session.execute(select(table.c.name, table.c.count)).all())
+
+    missing = [name for name in models if name not in counts]
+    for name in missing:
+        model = models[name]
+        # INSERT ... SELECT count(*) je jedna naredba, pa nijedan insert ne "propadne" između
+        try:
+            db.session.execute(insert(table).from_select(
+                ["name", "count"],
+                select(literal(name), func.count()).select_from(model.__table__),
+            ))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # drugi worker ga je upravo inicijalizirao
+    if missing:
+        counts = dict(db.session.execute(select(table.c.name, table.c.count)).all())
+
+    return {name: counts.get(name, 0) for name in models}
+
+
+def bump_count(db, counter_model, name, delta):
+    """Ručna promjena brojača – za skupne insertove koji zaobilaze ORM evente."""
+    table = counter_model.__table__
+    db.session.execute(
+        update(table).where(table.c.name == name).values(count=table.c.count + delta)
+    )
+
+
+def track_daily(stat_model, sources):
+    """Dnevni zbroj novih redaka: {"contact": (Contact, "datum_poruke", None), ...}.
+
+    Treći element je stupac po kojem se još grupira (npr. event_id), None = bez."""
+    table = stat_model.__table__
+
+    for name, (model, date_field, group_field) in sources.items():
+        def listener(mapper, connection, target, name=name, date_field=date_field, group_field=group_field):
+            datum = getattr(target, date_field)
+            if datum is not None:
+                grupa = getattr(target, group_field) if group_field else None
+                add_daily(connection, table, name, datum.strftime("%Y-%m-%d"), grupa or 0, 1)
+        event.listen(model, "after_insert", listener)
+
+
+def add_daily(connection, table, name, dan, event_id, delta):
+    """Upsert jednog dnevnog zbroja – jedna naredba, bez utrke dvaju workera za novi dan."""
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        kljuc = (table.c.tablica == name) & (table.c.dan == dan) & (table.c.event_id == event_id)
+        if not connection.execute(update(table).where(kljuc).values(broj=table.c.broj + delta)).rowcount:
+            connection.execute(insert(table).values(tablica=name, dan=dan, event_id=event_id, broj=delta))
+        return
+    stmt = (sqlite_insert if dialect == "sqlite" else pg_insert)(table).values(
+        tablica=name, dan=dan, event_id=event_id, broj=delta
+    )
+    connection.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.tablica, table.c.dan, table.c.event_id],
+        set_={"broj": table.c.broj + stmt.excluded.broj},
+    ))
+
+
+def track_versions(version_model, models):
+    """Svaka promjena retka u modelu poveća verziju njegove tablice (u istoj transakciji)."""
+    for name, model in models.items():
+        def listener(mapper, connection, target, name=name):
+            _bump(connection, version_model.__table__, name)
+        for identifier in ("after_insert", "after_update", "after_delete"):
+            event.listen(model, identifier, listener)
+
+
+def _bump(connection, table, name):
+    connection.execute(
+        update(table)
+        .where(table.c.name == name)
+        .values(version=table.c.version + 1, updated_at=datetime.utcnow())
+    )
+
+
+def read_versions(db, version_model, names):
+    """{ime: (verzija, vrijeme_promjene)} jednim upitom; nedostajuće verzije se kreiraju."""
+    table = version_model.__table__
+    upit = select(table.c.name, table.c.version, table.c.updated_at).where(table.c.name.in_(names))
+    versions = {name: (version, updated_at) for name, version, updated_at in db.session.execute(upit)}
+
+    missing = [name for name in names if name not in versions]
+    for name in missing:
+        try:
+            db.session.execute(insert(table).values(name=name, version=1, updated_at=datetime.utcnow()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+    if missing:
+        versions = {name: (version, updated_at) for name, version, updated_at in db.session.execute(upit)}
+
+    return versions
+
+
+def bump_version(db, version_model, name):
+    """Ručno povećanje verzije – za skupne insertove koji zaobilaze ORM evente."""
+    _bump(db.session.connection(), version_model.__table__, name)
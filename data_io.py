@@ -0,0 +1,115 @@
+# data_io.py
+"""
+Streaming izvoz (CSV / JSONL) i skupni uvoz podataka.
+
+Izvoz čita tablicu u serijama po primarnom ključu (WHERE id > zadnji LIMIT n)
+i odmah ih šalje dalje, pa potrošnja memorije ne ovisi o broju redaka.
+Uvoz sprema retke u serijama – jedna transakcija po seriji, ne po retku.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy import insert, select
+
+
+def iter_rows(db, model, fields, batch_size=1000):
+    """Generator tupleova (samo traženi stupci, bez ORM objekata)."""
+    table = model.__table__
+    cols = [table.c[f] for f in fields]
+    pk = table.c.id
+    zadnji = None
+    while True:
+        # keyset_batch: namjerno ponovljen SELECT, profiler ga ne prijavljuje kao N+1
+        stmt = select(*cols).order_by(pk).limit(batch_size).execution_options(keyset_batch=True)
+        if zadnji is not None:
+            stmt = stmt.where(pk > zadnji)
+        rows = db.session.execute(stmt).all()
+        if not rows:
+            return
+        yield from rows
+        zadnji = rows[-1][fields.index("id")]
+        # Kratke transakcije – ne držimo read lock dok klijent sporo preuzima
+        db.session.rollback()
+        if len(rows) < batch_size:
+            return
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_csv(db, model, fields, batch_size=1000):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    for i, row in enumerate(iter_rows(db, model, fields, batch_size), 1):
+        writer.writerow([_plain(v) for v in row])
+        if i % 200 == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+def export_jsonl(db, model, fields, batch_size=1000):
+    chunk = []
+    for row in iter_rows(db, model, fields, batch_size):
+        chunk.append(json.dumps({f: _plain(v) for f, v in zip(fields, row)}, ensure_ascii=False))
+        if len(chunk) == 200:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def read_records(stream, fmt):
+    """Čita CSV ili JSONL iz tekstualnog streama, redak po redak (neispravan JSON → ValueError u nizu)."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        for broj, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                # Kao i loš CSV redak: bulk_import ga preskoči i prijavi, uvoz ide dalje
+                yield ValueError(f"redak {broj}: neispravan JSON ({e.msg})")
+
+
+def bulk_import(db, model, records, clean, batch_size=500, on_batch=None):
+    """
+    Uvezi zapise u serijama. `clean(rec)` vraća dict za insert ili baca ValueError.
+    `on_batch(broj)` se poziva unutar transakcije serije (npr. za brojače).
+    Vraća (uvezeno, lista_grešaka).
+    """
+    uvezeno, greske, serija = 0, [], []
+
+    def flush():
+        nonlocal uvezeno
+        if not serija:
+            return
+        db.session.execute(insert(model), serija)
+        if on_batch:
+            on_batch(len(serija))
+        db.session.commit()
+        uvezeno += len(serija)
+        serija.clear()
+
+    for broj, rec in enumerate(records, 1):
+        if isinstance(rec, ValueError):  # read_records: redak se nije dao pročitati
+            greske.append(str(rec))
+            continue
+        try:
+            serija.append(clean(rec))
+        except (ValueError, KeyError, TypeError) as e:
+            greske.append(f"redak {broj}: {e}")
+            continue
+        if len(serija) >= batch_size:
+            flush()
+    flush()
+    return uvezeno, greske
@@ -0,0 +1,64 @@
+# db_config.py
+"""
+Konfiguracija baze za rad s više gunicorn workera.
+
+SQLite:   WAL (čitatelji ne čekaju pisca), synchronous=NORMAL (SQLITE_SYNCHRONOUS=FULL
+          za fsync na svakom commitu), busy_timeout
+          (čekaj lock umjesto "database is locked"), veći page cache.
+Postgres: pool konekcija s pre-pingom i recikliranjem (DATABASE_URL).
+
+Pod gevent workerom busy_timeout je kratak – vidi concurrency.py.
+"""
+import os
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from concurrency import sqlite_busy_timeout
+
+_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+if _SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    raise ValueError(f"SQLITE_SYNCHRONOUS: nepoznata vrijednost {_SYNCHRONOUS!r}")
+
+
+def database_uri(default_path, env="DATABASE_URL"):
+    uri = os.getenv(env, f"sqlite:///{default_path}")
+    # Render/Heroku još daju stari "postgres://" prefiks koji SQLAlchemy 2 ne prihvaća
+    if uri.startswith("postgres://"):
+        uri = "postgresql://" + uri[len("postgres://"):]
+    return uri
+
+
+def engine_options(uri):
+    """SQLALCHEMY_ENGINE_OPTIONS prilagođene backendu."""
+    url = make_url(uri)
+    if url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            return {}
+        return {
+            "connect_args": {"timeout": sqlite_busy_timeout() / 1000},
+            # Svaki worker ima mali pool – SQLite ionako ima samo jednog pisca
+            "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+            "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 5)),
+        }
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 5)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 10)),
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 300)),
+    }
+
+
+@event.listens_for(Engine, "connect")
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # Pragme vrijede po konekciji, pa se postavljaju na svakoj novoj
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={sqlite_busy_timeout()}")
+    cursor.execute(f"PRAGMA cache_size=-{int(os.getenv('SQLITE_CACHE_KB', 20000))}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
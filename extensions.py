@@ -0,0 +1,102 @@
+# extensions.py
+"""
+Zajednički objekti aplikacije.
+
+db i mail su obična Flask proširenja (init_app u create_app).
+Servisi (red za e-mail, obavijesti, group commit, backup, cache, rate limiter) kreiraju se tek kod prve upotrebe
+u pojedinom procesu, pa pokretanje workera ne plaća ništa što mu ne treba.
+"""
+import threading
+
+from flask import current_app
+from flask_mail import Mail
+from flask_sqlalchemy import SQLAlchemy
+from werkzeug.local import LocalProxy
+
+db = SQLAlchemy()
+mail = Mail()
+
+_lock = threading.Lock()
+
+
+def _service(name, factory):
+    def get():
+        app = current_app._get_current_object()
+        if name not in app.extensions:
+            with _lock:
+                if name not in app.extensions:
+                    app.extensions[name] = factory(app)
+        return app.extensions[name]
+    return LocalProxy(get)
+
+
+def _make_mail_queue(app):
+    from mail_queue import MailQueue
+    from models import OutboxMail
+
+    return MailQueue(app, db, mail, OutboxMail)
+
+
+def _make_bulk_mailer(app):
+    from bulk_mail import BulkMailer
+    from models import Announcement, EventRegistration
+
+    return BulkMailer(app, db, mail, Announcement, EventRegistration)
+
+
+def _make_ingest(app):
+    from ingest import GroupCommitWriter
+
+    return GroupCommitWriter(
+        app, db,
+        enabled=app.config["INGEST_GROUP_COMMIT"],
+        max_batch=app.config["INGEST_MAX_BATCH"],
+        max_wait=app.config["INGEST_MAX_WAIT_MS"] / 1000,
+    )
+
+
+def _make_backup_manager(app):
+    from sqlalchemy.engine import make_url
+    from backup import BackupManager
+
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+    return BackupManager(
+        db_path=url.database if url.get_backend_name() == "sqlite" else None,
+        backup_dir=app.config["BACKUP_DIR"],
+        keep=app.config["BACKUP_KEEP"],
+        hourly=app.config["BACKUP_KEEP_HOURLY"],
+        daily=app.config["BACKUP_KEEP_DAILY"],
+        weekly=app.config["BACKUP_KEEP_WEEKLY"],
+        chunk_size=app.config["BACKUP_CHUNK_KB"] * 1024,
+        interval=app.config["BACKUP_INTERVAL"],
+        min_gap=app.config["BACKUP_MIN_GAP"],
+    )
+
+
+def _make_page_cache(app):
+    from cache import make_cache
+
+    return make_cache(
+        app.config["PAGE_CACHE_BACKEND"], app.config["PAGE_CACHE_PATH"], app.config["PAGE_CACHE_MAX_ENTRIES"]
+    )
+
+
+def _make_rate_limiter(app):
+    from ratelimit import make_limiter, parse_limit
+
+    return make_limiter(
+        app.config["RATELIMIT_BACKEND"],
+        app.config["RATELIMIT_PATH"],
+        {
+            "ip": parse_limit(app.config["RATELIMIT_PER_IP"]),
+            "email": parse_limit(app.config["RATELIMIT_PER_EMAIL"]),
+        },
+    )
+
+
+mail_queue = _service("mail_queue", _make_mail_queue)
+bulk_mailer = _service("bulk_mailer", _make_bulk_mailer)
+ingest = _service("ingest", _make_ingest)
+backup_manager = _service("backup_manager", _make_backup_manager)
+page_cache = _service("page_cache", _make_page_cache)
+rate_limiter = _service("rate_limiter", _make_rate_limiter)
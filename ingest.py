@@ -0,0 +1,131 @@
+# ingest.py
+"""
+Group commit za rute koje samo dodaju retke (prijava, kontakt poruka).
+
+Kad se otvore prijave na događaj, stotine zahtjeva u istoj sekundi rade
+svaki svoj INSERT + COMMIT: svaki commit je zaseban zapis u WAL (uz
+SQLITE_SYNCHRONOUS=FULL i zaseban fsync), a svi se bore za jedan write lock.
+
+S INGEST_GROUP_COMMIT=True ruta ne commita sama: `ingest.run(work)` preda
+posao jednoj pisačkoj niti u procesu i čeka. Pisač skupi sve što je stiglo
+(najviše INGEST_MAX_BATCH poslova, najdulje INGEST_MAX_WAIT_MS od prvog),
+izvrši ih u JEDNOJ transakciji i tek nakon commita pusti zahtjeve dalje –
+odgovor "prijava je primljena" znači da je prijava u bazi, kao i prije.
+
+Ako serija ne prođe, svaki se posao ponovi u svojoj transakciji, pa greška
+ode samo zahtjevu koji ju je izazvao. Zato posao mora biti ponovljiv i ne
+smije sam commitati.
+
+Serije nastaju samo kad jedan proces istovremeno poslužuje više zahtjeva
+(gunicorn -k gevent ili --threads); sync worker ima uvijek jedan posao.
+Bez INGEST_GROUP_COMMIT `run` je isto što i prije: write_transaction + commit.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import OperationalError
+
+from concurrency import locked_error, write_transaction
+from metrics import registry
+
+
+class _Job:
+    __slots__ = ("work", "done", "result", "error")
+
+    def __init__(self, work):
+        self.work = work
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def finish(self, result=None, error=None):
+        self.result, self.error = result, error
+        self.done.set()
+
+
+class GroupCommitWriter:
+    def __init__(self, app, db, enabled=False, max_batch=64, max_wait=0.002):
+        self.app = app
+        self.db = db
+        self.enabled = enabled
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._cond = threading.Condition()
+        self._pending = deque()
+        self._thread = None
+        self._pid = None
+
+    def run(self, work):
+        """Izvrši `work()` u transakciji i vrati njegov rezultat nakon commita."""
+        if not self.enabled:
+            def commit():
+                rezultat = work()
+                self.db.session.commit()
+                return rezultat
+            return write_transaction(self.db, commit)
+
+        job = _Job(work)
+        with self._cond:
+            self._start()
+            self._pending.append(job)
+            self._cond.notify()
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    # 🔹 Pisačka nit (jedna po procesu)
+    def _start(self):
+        if self._pid != os.getpid() or not (self._thread and self._thread.is_alive()):
+            self._pid = os.getpid()
+            self._pending.clear()  # poslovi roditelja nakon forka nisu naši
+            self._thread = threading.Thread(target=self._run, name="group-commit", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Pričekaj još malo da se serija napuni (0 = uzmi samo ono što već čeka)
+                rok = time.monotonic() + self.max_wait
+                while len(self._pending) < self.max_batch:
+                    ostalo = rok - time.monotonic()
+                    if ostalo <= 0:
+                        break
+                    self._cond.wait(ostalo)
+                serija = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch))]
+            try:
+                with self.app.app_context():
+                    self._commit(serija)
+            except Exception as e:
+                for job in serija:
+                    if not job.done.is_set():
+                        job.finish(error=e)
+
+    def _commit(self, serija):
+        def izvrsi():
+            rezultati = [job.work() for job in serija]
+            self.db.session.commit()
+            return rezultati
+
+        t0 = time.perf_counter()
+        try:
+            rezultati = write_transaction(self.db, izvrsi)
+        except Exception as e:
+            self.db.session.rollback()
+            if len(serija) == 1 or (isinstance(e, OperationalError) and locked_error(e)):
+                for job in serija:
+                    job.finish(error=e)
+                return
+            # Neki posao ne prolazi – svaki zasebno, da greška ode samo njegovom zahtjevu
+            for job in serija:
+                self._commit([job])
+            return
+        registry.observe("versus_ingest_batch_size", len(serija))
+        registry.observe("versus_ingest_commit_seconds", time.perf_counter() - t0)
+        for job, rezultat in zip(serija, rezultati):
+            job.finish(rezultat)
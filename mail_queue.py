@@ -0,0 +1,179 @@
+# mail_queue.py
+"""
+Trajni red za odlazne e-mailove (outbox).
+
+Rute samo dodaju redak u tablicu `outbox_mail` u ISTOJ transakciji kao i
+svoj podatak (prijava, poruka...), pa se vraćaju odmah nakon commita.
+Pozadinska nit u svakom gunicorn workeru preuzima retke, šalje ih preko
+jedne otvorene SMTP konekcije i ponavlja neuspjele uz eksponencijalni backoff.
+"""
+import os
+import smtplib
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask_mail import Message
+
+from metrics import registry
+
+_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
+
+
+class MailQueue:
+    def __init__(self, app, db, mail, model):
+        self.app = app
+        self.db = db
+        self.mail = mail
+        self.model = model
+
+        self.batch_size = app.config.get("MAIL_QUEUE_BATCH", 20)
+        self.max_attempts = app.config.get("MAIL_QUEUE_MAX_ATTEMPTS", 6)
+        self.backoff = app.config.get("MAIL_QUEUE_BACKOFF", 30)
+        self.lease = app.config.get("MAIL_QUEUE_LEASE", 120)
+        self.poll = app.config.get("MAIL_QUEUE_POLL", 5)
+        self.idle = app.config.get("MAIL_QUEUE_IDLE", 30)
+
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._conn = None
+        self._conn_used = 0.0
+
+    # 🔹 Dodavanje u red (bez commita – commit radi ruta)
+    def enqueue(self, subject, recipients, body, sender=None):
+        row = self.model(
+            subject=subject,
+            sender=sender,
+            recipients=",".join(recipients),
+            body=body,
+        )
+        self.db.session.add(row)
+        return row
+
+    # 🔹 Pozadinska nit (jedna po procesu; pokreće je prvi zahtjev, vidi routes.py)
+    def start(self):
+        if self._pid != os.getpid() or not (self._thread and self._thread.is_alive()):
+            self._pid = os.getpid()
+            self._conn = None
+            self._thread = threading.Thread(target=self._run, name="mail-queue", daemon=True)
+            self._thread.start()
+
+    # 🔹 Probudi pošiljatelja (novi redak u redu)
+    def notify(self):
+        self.start()
+        self._wake.set()
+
+    # 🔹 Sinkrono pošalji sve što je spremno (CLI, testovi)
+    def flush(self):
+        ukupno = 0
+        with self.app.app_context():
+            try:
+                while True:
+                    poslano = self.process_batch()
+                    if not poslano:
+                        break
+                    ukupno += poslano
+            finally:
+                self._close()
+        return ukupno
+
+    def _run(self):
+        while True:
+            try:
+                with self.app.app_context():
+                    poslano = self.process_batch()
+                    if not poslano and self._conn and time.monotonic() - self._conn_used > self.idle:
+                        self._close()
+            except Exception as e:
+                print(f"⚠️ Greška u redu za e-mail: {e}")
+                self._close()
+                poslano = 0
+
+            if not poslano:
+                self._wake.wait(self.poll)
+                self._wake.clear()
+
+    def _claim(self):
+        """Atomarno preuzmi dospjele retke – siguran rad s više workera."""
+        Outbox = self.model
+        now = datetime.utcnow()
+        kandidati = [
+            r.id for r in
+            Outbox.query.with_entities(Outbox.id)
+            .filter(Outbox.status == "pending", Outbox.next_attempt_at <= now)
+            .order_by(Outbox.id)
+            .limit(self.batch_size)
+        ]
+        preuzeti = []
+        for mail_id in kandidati:
+            # Lease: dok traje, drugi workeri ne vide redak; ako worker padne, redak se vraća
+            rez = Outbox.query.filter(
+                Outbox.id == mail_id,
+                Outbox.status == "pending",
+                Outbox.next_attempt_at <= now,
+            ).update({"next_attempt_at": now + timedelta(seconds=self.lease)},
+                     synchronize_session=False)
+            if rez:
+                preuzeti.append(mail_id)
+        self.db.session.commit()
+        return preuzeti
+
+    def process_batch(self):
+        preuzeti = self._claim()
+        if not preuzeti:
+            return 0
+
+        for row in self.model.query.filter(self.model.id.in_(preuzeti)).order_by(self.model.id):
+            msg = Message(
+                subject=row.subject,
+                sender=row.sender or None,
+                recipients=row.recipients.split(","),
+                body=row.body,
+            )
+            t0 = time.perf_counter()
+            try:
+                self._connection().send(msg)
+                registry.observe("versus_mail_send_duration_seconds", time.perf_counter() - t0)
+                registry.inc("versus_mail_sent_total", result="sent")
+                self._conn_used = time.monotonic()
+                row.status = "sent"
+                row.sent_at = datetime.utcnow()
+                row.last_error = None
+            except Exception as e:
+                # Greške vezane uz samu poruku ne traže novu konekciju
+                if not isinstance(e, _MESSAGE_ERRORS):
+                    self._close(quit=False)
+                registry.inc("versus_mail_sent_total", result="error")
+                row.attempts += 1
+                row.last_error = str(e)[:500]
+                if row.attempts >= self.max_attempts:
+                    row.status = "failed"
+                    print(f"⚠️ E-mail #{row.id} odbačen nakon {row.attempts} pokušaja: {e}")
+                else:
+                    pauza = self.backoff * 2 ** (row.attempts - 1)
+                    row.next_attempt_at = datetime.utcnow() + timedelta(seconds=pauza)
+
+        self.db.session.commit()
+        registry.flush()
+        return len(preuzeti)
+
+    # 🔹 Jedna SMTP konekcija po workeru, zatvara se nakon neaktivnosti
+    def _connection(self):
+        if self._conn is None:
+            conn = self.mail.connect()
+            conn.__enter__()
+            self._conn = conn
+        return self._conn
+
+    def _close(self, quit=True):
+        conn, self._conn = self._conn, None
+        if conn is not None and quit:
+            try:
+                conn.__exit__(None, None, None)
+            except Exception:
+                pass
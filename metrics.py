@@ -0,0 +1,177 @@
+# metrics.py
+"""
+Metrike u Prometheus formatu, bez vanjskih paketa.
+
+Svaki proces (gunicorn worker) skuplja metrike u memoriji – jedno mjerenje je
+samo nekoliko zbrajanja pod lockom. Najviše svakih METRICS_FLUSH sekundi
+proces zapisuje svoje stanje u vlastitu JSON datoteku u METRICS_DIR, a
+/admin/metrics zbraja datoteke svih workera.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# naziv: (tip, opis, bucketi)
+METRICS = {
+    "versus_http_request_duration_seconds": ("histogram", "Trajanje HTTP zahtjeva po ruti", LATENCY_BUCKETS),
+    "versus_http_requests_total": ("counter", "Broj HTTP zahtjeva po ruti i statusu", None),
+    "versus_request_sql_queries": ("histogram", "Broj SQL upita po zahtjevu", COUNT_BUCKETS),
+    "versus_request_sql_seconds": ("histogram", "Ukupno vrijeme SQL upita po zahtjevu", LATENCY_BUCKETS),
+    "versus_mail_send_duration_seconds": ("histogram", "Trajanje slanja jednog e-maila", LATENCY_BUCKETS),
+    "versus_mail_sent_total": ("counter", "Poslani i neuspjeli e-mailovi", None),
+    "versus_mail_bulk_sent_total": ("counter", "Poslane i neuspjele obavijesti prijavljenima", None),
+    "versus_ingest_batch_size": ("histogram", "Broj zahtjeva po group commit transakciji", COUNT_BUCKETS),
+    "versus_ingest_commit_seconds": ("histogram", "Trajanje group commit transakcije", LATENCY_BUCKETS),
+    "versus_backup_duration_seconds": ("histogram", "Trajanje backupa baze", LATENCY_BUCKETS),
+    "versus_ratelimit_rejected_total": ("counter", "Zahtjevi odbijeni zbog rate limita", None),
+}
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.directory = None
+        self.interval = 5.0
+        self._reset()
+
+    def configure(self, directory, interval):
+        self.directory = directory
+        self.interval = interval
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._file = f"{self._pid}-{time.time_ns()}.json"
+        self._series = {}
+        self._last_flush = 0.0
+
+    def _check_fork(self):
+        # Nakon forka (gunicorn --preload) dijete ne smije nastaviti brojati roditeljeve vrijednosti
+        if self._pid != os.getpid():
+            self._reset()
+
+    def observe(self, name, value, **labels):
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            serija = self._series.get(key)
+            if serija is None:
+                serija = self._series[key] = [0] * len(buckets) + [0.0, 0]
+            i = bisect.bisect_left(buckets, value)
+            if i < len(buckets):
+                serija[i] += 1
+            serija[-2] += value
+            serija[-1] += 1
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._check_fork()
+            self._series[key] = self._series.get(key, 0) + value
+
+    def flush(self, force=False):
+        """Zapiši stanje procesa u METRICS_DIR (najviše jednom u `interval` sekundi)."""
+        now = time.monotonic()
+        if not self.directory or (not force and now - self._last_flush < self.interval):
+            return
+        with self._lock:
+            self._check_fork()
+            self._last_flush = now
+            podaci = [[name, list(labels), value] for (name, labels), value in self._series.items()]
+            filename = self._file
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, filename)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(podaci, f)
+        os.replace(path + ".tmp", path)
+
+
+registry = Registry()
+
+
+# 🔹 Broj i trajanje SQL upita unutar trenutnog zahtjeva
+@event.listens_for(Engine, "before_cursor_execute")
+def _sql_start(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        conn.info.setdefault("metrics_t0", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _sql_end(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_t0")
+    if starts and has_request_context():
+        g.sql_queries = g.get("sql_queries", 0) + 1
+        g.sql_seconds = g.get("sql_seconds", 0.0) + time.perf_counter() - starts.pop()
+
+
+@event.listens_for(Engine, "handle_error")
+def _sql_error(context):
+    # Neuspjeli upit nema after_cursor_execute – makni njegov početak sa stoga konekcije
+    conn = context.connection
+    starts = conn.info.get("metrics_t0") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def _collect(directory):
+    ukupno = {}
+    for filename in os.listdir(directory) if os.path.isdir(directory) else []:
+        if not filename.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, filename), encoding="utf-8") as f:
+                podaci = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, labels, value in podaci:
+            if name not in METRICS:
+                continue
+            key = (name, tuple(tuple(par) for par in labels))
+            if isinstance(value, list):
+                postojece = ukupno.setdefault(key, [0] * len(value))
+                ukupno[key] = [a + b for a, b in zip(postojece, value)]
+            else:
+                ukupno[key] = ukupno.get(key, 0) + value
+    return ukupno
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def render(directory):
+    """Zbroji metrike svih workera i vrati tekst u Prometheus formatu."""
+    ukupno = _collect(directory)
+    linije = []
+    for name, (tip, opis, buckets) in METRICS.items():
+        serije = sorted((labels, v) for (n, labels), v in ukupno.items() if n == name)
+        linije.append(f"# HELP {name} {opis}")
+        linije.append(f"# TYPE {name} {tip}")
+        for labels, value in serije:
+            if tip == "counter":
+                linije.append(f"{name}{_labels(labels)} {value}")
+                continue
+            kumulativno = 0
+            for granica, broj in zip(buckets, value):
+                kumulativno += broj
+                linije.append(f"{name}_bucket{_labels(labels, [('le', granica)])} {kumulativno}")
+            linije.append(f"{name}_bucket{_labels(labels, [('le', '+Inf')])} {value[-1]}")
+            linije.append(f"{name}_sum{_labels(labels)} {value[-2]}")
+            linije.append(f"{name}_count{_labels(labels)} {value[-1]}")
+    return "\n".join(linije) + "\n"
@@ -0,0 +1,93 @@
+# migrations.py
+"""
+Izmjene sheme postojećih baza (db.create_all kreira samo nove tablice).
+
+Svaki korak je idempotentan: provjeri stanje baze i napravi samo ono što
+nedostaje, pa se `flask init-db` smije pokretati na svakom deployu.
+"""
+from sqlalchemy import inspect, text
+
+# Stari register_event() je imena događaja uzimao iz ovog rječnika
+LEGACY_EVENT_IDS = {"Python Osnove": 1, "Web razvoj Flask": 2}
+
+
+def _columns(conn, table):
+    return {c["name"] for c in inspect(conn).get_columns(table)}
+
+
+def _add_columns(conn, table, columns):
+    """columns: {ime: DDL}; dodaje samo stupce koji ne postoje. Vraća dodana imena."""
+    postojeci = _columns(conn, table)
+    dodani = [name for name in columns if name not in postojeci]
+    for name in dodani:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {columns[name]}"))
+    return dodani
+
+
+def link_registrations_to_events(conn, log=print):
+    """EventRegistration.event_naziv (slobodan tekst) → event_id + broj prijava po događaju."""
+    _add_columns(conn, "event", {
+        "kapacitet": "INTEGER",
+        "broj_prijava": "INTEGER NOT NULL DEFAULT 0",
+    })
+    dodan = _add_columns(conn, "event_registration", {"event_id": "INTEGER REFERENCES event(id)"})
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_event_registration_event_id ON event_registration (event_id, id)"
+    ))
+    if not dodan:
+        return
+
+    # 1) po nazivu događaja, 2) po starom hardkodiranom rječniku (ako taj događaj postoji)
+    conn.execute(text(
+        "UPDATE event_registration SET event_id = "
+        "(SELECT min(e.id) FROM event e WHERE e.naziv = event_registration.event_naziv) "
+        "WHERE event_id IS NULL"
+    ))
+    for naziv, event_id in LEGACY_EVENT_IDS.items():
+        conn.execute(text(
+            "UPDATE event_registration SET event_id = :event_id "
+            "WHERE event_id IS NULL AND event_naziv = :naziv "
+            "AND EXISTS (SELECT 1 FROM event WHERE id = :event_id)"
+        ), {"event_id": event_id, "naziv": naziv})
+
+    conn.execute(text(
+        "UPDATE event SET broj_prijava = "
+        "(SELECT count(*) FROM event_registration r WHERE r.event_id = event.id)"
+    ))
+    nepovezano = conn.execute(text(
+        "SELECT count(*) FROM event_registration WHERE event_id IS NULL"
+    )).scalar()
+    if nepovezano:
+        log(f"⚠️ {nepovezano} prijava nije povezano ni s jednim događajem (event_id ostaje prazan)")
+
+
+def add_message_timestamps(conn, log=print):
+    """Contact.datum_poruke + indeksi po datumu (arhiviranje starih redaka)."""
+    if _add_columns(conn, "contact", {"datum_poruke": "DATETIME"}):
+        # Stvarno vrijeme starih poruka ne znamo – računaju se od ove migracije
+        n = conn.execute(text(
+            "UPDATE contact SET datum_poruke = CURRENT_TIMESTAMP WHERE datum_poruke IS NULL"
+        )).rowcount
+        if n:
+            log(f"ℹ️ {n} postojećih poruka dobilo je datum_poruke = vrijeme migracije")
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_contact_datum_poruke ON contact (datum_poruke)"))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_event_registration_datum_prijave ON event_registration (datum_prijave)"
+    ))
+
+
+def add_registration_email_index(conn, log=print):
+    """Indeks za preskakanje dvostrukih adresa pri slanju obavijesti (bulk_mail)."""
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_event_registration_email "
+        "ON event_registration (event_id, lower(trim(email)), id)"
+    ))
+
+
+STEPS = [link_registrations_to_events, add_message_timestamps, add_registration_email_index]
+
+
+def upgrade(db, log=print):
+    with db.engine.begin() as conn:
+        for step in STEPS:
+            step(conn, log)
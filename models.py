@@ -0,0 +1,187 @@
+# models.py
+from datetime import datetime
+
+from extensions import db
+from counters import track_counts, track_daily, track_versions
+
+
+# 🔹 Model za tečajeve
+class Course(db.Model):
+    __tablename__ = 'course'
+
+    id = db.Column(db.Integer, primary_key=True)
+    naziv = db.Column(db.String(100), nullable=False)
+    opis = db.Column(db.Text, nullable=True)
+    cijena = db.Column(db.Float, nullable=True)
+
+    def __repr__(self):
+        return f"<Course {self.naziv}>"
+
+class Contact(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    ime = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    poruka = db.Column(db.String(500), nullable=False)
+    # Poruke starije od ARCHIVE_AFTER_DAYS sele u arhivu (vidi archive.py)
+    datum_poruke = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class Event(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    naziv = db.Column(db.String(150), nullable=False)
+    opis = db.Column(db.Text, nullable=True)
+    kapacitet = db.Column(db.Integer, nullable=True)  # None = bez ograničenja
+    # Održava register_event() u istoj transakciji kao i prijavu
+    broj_prijava = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+# 📅 Model za prijave na događaje
+class EventRegistration(db.Model):
+    __table_args__ = (
+        # Popis prijava po događaju (keyset po id-u) je čisti indeks lookup
+        db.Index("ix_event_registration_event_id", "event_id", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    ime = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), nullable=True)
+    # Naziv u trenutku prijave (ostaje i ako se događaj preimenuje ili obriše)
+    event_naziv = db.Column(db.String(150), nullable=False)
+    poruka = db.Column(db.Text)
+    datum_prijave = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<Prijava {self.ime} za {self.event_naziv}>"
+
+
+# Obavijesti: "je li ista adresa već prijavljena na događaj" (bulk_mail.email_key)
+db.Index(
+    "ix_event_registration_email",
+    EventRegistration.event_id,
+    db.func.lower(db.func.trim(EventRegistration.email)),
+    EventRegistration.id,
+)
+
+
+# 🗄️ Arhiva (zasebna baza, bind "archive") – isti stupci + vrijeme arhiviranja
+class ArchivedContact(db.Model):
+    __bind_key__ = "archive"
+    __tablename__ = "contact_archive"
+
+    id = db.Column(db.Integer, primary_key=True)  # isti id kao u vrućoj bazi
+    ime = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False, index=True)
+    poruka = db.Column(db.String(500), nullable=False)
+    datum_poruke = db.Column(db.DateTime, index=True)
+    arhivirano = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class ArchivedRegistration(db.Model):
+    __bind_key__ = "archive"
+    __tablename__ = "event_registration_archive"
+
+    id = db.Column(db.Integer, primary_key=True)
+    ime = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False, index=True)
+    event_id = db.Column(db.Integer, nullable=True, index=True)
+    event_naziv = db.Column(db.String(150), nullable=False)
+    poruka = db.Column(db.Text)
+    datum_prijave = db.Column(db.DateTime, index=True)
+    arhivirano = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# 📦 Sažetak arhiviranih redaka po mjesecu (i događaju) – ostaje u vrućoj bazi
+class ArchiveSummary(db.Model):
+    __tablename__ = "archive_summary"
+
+    tablica = db.Column(db.String(50), primary_key=True)
+    mjesec = db.Column(db.String(7), primary_key=True)  # "2024-05"
+    event_id = db.Column(db.Integer, primary_key=True, default=0)  # 0 = nije prijava / bez događaja
+    broj = db.Column(db.Integer, nullable=False, default=0)
+
+# 📊 Dnevni zbrojevi za analitiku (vidi analytics.py) – broj redaka raste s danima, ne s prijavama
+class DailyStat(db.Model):
+    __tablename__ = "daily_stat"
+
+    tablica = db.Column(db.String(50), primary_key=True)
+    dan = db.Column(db.String(10), primary_key=True)  # "2024-05-01" (UTC)
+    event_id = db.Column(db.Integer, primary_key=True, default=0)  # 0 = nije prijava / bez događaja
+    broj = db.Column(db.Integer, nullable=False, default=0)
+
+# 📬 Red odlaznih e-mailova (šalje ih pozadinska nit, vidi mail_queue.py)
+class OutboxMail(db.Model):
+    __tablename__ = 'outbox_mail'
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=True)
+    recipients = db.Column(db.Text, nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default="pending", index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxMail {self.id} {self.status}>"
+
+# 📣 Obavijest svima prijavljenima na događaj (šalje je bulk_mail.py u serijama)
+class Announcement(db.Model):
+    __tablename__ = 'announcement'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey("event.id"), nullable=True, index=True)
+    event_naziv = db.Column(db.String(150), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)  # Jinja predložak
+    body = db.Column(db.Text, nullable=False)  # Jinja predložak
+    status = db.Column(db.String(10), nullable=False, default="pending", index=True)
+    total = db.Column(db.Integer, nullable=False, default=0)  # različitih adresa pri kreiranju
+    # Kursor za nastavak: sve prijave do ovog id-a su obrađene
+    last_registration_id = db.Column(db.Integer, nullable=False, default=0)
+    sent = db.Column(db.Integer, nullable=False, default=0)
+    failed = db.Column(db.Integer, nullable=False, default=0)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.String(500), nullable=True)
+    owner = db.Column(db.String(120), nullable=True)
+    lease_until = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Announcement {self.id} {self.status}>"
+
+# 🔢 Broj redaka po tablici (održava se na svaki insert/delete, vidi counters.py)
+class TableCounter(db.Model):
+    __tablename__ = 'table_counter'
+
+    name = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+# 🏷️ Verzija tablice (svaka promjena je povećava, vidi counters.py) – za ETag / Last-Modified
+class TableVersion(db.Model):
+    __tablename__ = 'table_version'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+COUNTED_MODELS = {
+    "course": Course,
+    "contact": Contact,
+    "event": Event,
+    "event_registration": EventRegistration,
+}
+track_counts(TableCounter, COUNTED_MODELS)
+
+VERSIONED_MODELS = {
+    "course": Course,
+    "contact": Contact,
+    "event": Event,
+}
+track_versions(TableVersion, VERSIONED_MODELS)
+
+DAILY_MODELS = {
+    "contact": (Contact, "datum_poruke", None),
+    "event_registration": (EventRegistration, "datum_prijave", "event_id"),
+}
+track_daily(DailyStat, DAILY_MODELS)
@@ -0,0 +1,166 @@
+# ratelimit.py
+"""
+Ograničenje broja POST zahtjeva na forme (kontakt, prijava na događaj).
+
+Klizni prozor se računa kao procjena iz dva susjedna fiksna prozora:
+
+    broj = trenutni + prethodni * (dio prethodnog prozora koji još "klizi" u zadnjih N sekundi)
+
+Po ključu se čuvaju samo tri broja (prozor, trenutni, prethodni), pa je
+provjera O(1) i memorija ne ovisi o broju zahtjeva.
+
+Dva backenda, kao i kod cache.py:
+  - MemoryStore – OrderedDict s LRU izbacivanjem (ograničen broj ključeva)
+  - SQLiteStore – jedna datoteka koju dijele svi gunicorn workeri
+"""
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from concurrency import retry_locked, sqlite_busy_timeout, thread_local
+
+
+def parse_limit(value):
+    """'10/60' → (10, 60): najviše 10 zahtjeva u 60 sekundi."""
+    broj, _, sekunde = value.partition("/")
+    return int(broj), int(sekunde or 60)
+
+
+def _slide(state, window, now):
+    """(prozor, trenutni, prethodni) pomaknut na prozor u kojem je `now`."""
+    current = int(now // window)
+    if state is None:
+        return current, 0, 0
+    start, count, previous = state
+    if start == current:
+        return state
+    if start == current - 1:
+        return current, 0, count
+    return current, 0, 0
+
+
+def _estimate(state, window, now):
+    start, count, previous = state
+    elapsed = now / window - start  # 0..1 unutar trenutnog prozora
+    return count + previous * (1 - elapsed)
+
+
+def _decide(state, limit, window, now):
+    """Vraća (novo_stanje, dopušteno, retry_after)."""
+    state = _slide(state, window, now)
+    if _estimate(state, window, now) + 1 > limit:
+        start, count, previous = state
+        # Koliko još treba čekati da procjena padne ispod limita
+        if previous:
+            potrebno = 1 - (limit - 1 - count) / previous
+            retry_after = (start + min(max(potrebno, 0), 1)) * window - now
+        else:
+            retry_after = (start + 1) * window - now
+        return state, False, max(1, math.ceil(retry_after))
+    start, count, previous = state
+    return (start, count + 1, previous), True, 0
+
+
+class MemoryStore:
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            state, allowed, retry_after = _decide(self._data.get(key), limit, window, now)
+            self._data[key] = state
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return allowed, retry_after
+
+
+class SQLiteStore:
+    def __init__(self, path):
+        self.path = path
+        self._local = thread_local()
+
+    def _conn(self):
+        # Posebna konekcija po (OS) niti i po procesu (nakon forka ne dijelimo konekcije)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=sqlite_busy_timeout() / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limit ("
+                "key TEXT PRIMARY KEY, start INTEGER NOT NULL, count INTEGER NOT NULL, "
+                "previous INTEGER NOT NULL, window INTEGER NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        conn = self._conn()
+
+        def upisi():
+            # IMMEDIATE: čitanje i upis stanja su atomarni i između workera
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT start, count, previous FROM rate_limit WHERE key = ?", (key,)
+                ).fetchone()
+                state, allowed, retry_after = _decide(row, limit, window, now)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit (key, start, count, previous, window) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, *state, window),
+                )
+                if random.random() < 0.01:
+                    # Povremeno počisti ključeve čiji su oba prozora istekla
+                    conn.execute(
+                        "DELETE FROM rate_limit WHERE (start + 2) * window < ?", (now,)
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return allowed, retry_after
+
+        # Zaključan BEGIN se ponavlja kooperativno (kratki busy_timeout pod gevent-om)
+        return retry_locked(upisi)
+
+
+class RateLimiter:
+    """
+    limits: {"ip": (10, 60), "email": (3, 600)}. Zahtjev prolazi samo ako
+    prolazi SVE provjere; prva koja padne vraća (scope, retry_after).
+    """
+
+    def __init__(self, store, limits):
+        self.store = store
+        self.limits = limits
+
+    def check(self, endpoint, **identities):
+        for scope, value in identities.items():
+            if not value or scope not in self.limits:
+                continue
+            limit, window = self.limits[scope]
+            try:
+                allowed, retry_after = self.store.hit(f"{endpoint}:{scope}:{value}", limit, window)
+            except Exception as e:
+                # Limiter nikad ne smije srušiti formu
+                print(f"⚠️ Greška u rate limiteru: {e}")
+                continue
+            if not allowed:
+                return scope, retry_after
+        return None
+
+
+def make_limiter(backend, path, limits, maxsize=10000):
+    store = SQLiteStore(path) if backend == "sqlite" else MemoryStore(maxsize)
+    return RateLimiter(store, limits)
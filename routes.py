@@ -0,0 +1,945 @@
+# routes.py
+import hashlib
+import hmac
+import io
+import os
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import (
+    Blueprint, Response, abort, current_app, flash, g, jsonify, redirect, render_template,
+    request, session, stream_with_context, url_for,
+)
+from sqlalchemy import func, or_, select, update
+from werkzeug.http import is_resource_modified
+
+import analytics
+import api
+import archive
+import search
+from extensions import db, ingest, mail_queue, bulk_mailer, backup_manager, page_cache, rate_limiter
+from models import Course, Contact, Event, EventRegistration, TableCounter, TableVersion, COUNTED_MODELS
+from models import Announcement
+from models import ArchivedContact, ArchivedRegistration
+from counters import read_counts, bump_count, read_versions, bump_version
+from data_io import export_csv, export_jsonl, read_records, bulk_import, iter_rows
+from streaming import cache_stream, html_response, stream_page
+from utils import keyset_paginate
+from metrics import registry, render as render_metrics
+
+bp = Blueprint("main", __name__)
+
+# ⚡ Cache za javne stranice /courses i /events (vidi cache.py)
+def cached_page(namespace, stream):
+    """
+    Anonimni posjetitelji dijele jednu keširanu verziju stranice.
+    Admin (i svatko tko ima flash poruku na čekanju) uvijek dobiva svježi render,
+    pa admin gumbi i poruke nikad ne završe u cacheu.
+    `stream` vraća generator HTML komada (streaming.stream_page).
+    """
+    if session.get("admin_logged") or session.get("_flashes"):
+        return render_list(stream)
+    try:
+        # Ključ nosi ETag, pa tijelo iz cachea uvijek odgovara verziji u ETagu
+        value, full_key = page_cache.lookup(namespace, f"page:anon:{g.get('etag', '')}")
+    except Exception as e:
+        print(f"⚠️ Greška u cacheu: {e}")
+        return render_list(stream)
+    if value is not None:
+        return value
+    # Zadnji komad se šalje nakon što je kontekst zahtjeva zatvoren – treba pravi objekt, ne proxy
+    return html_response(cache_stream(
+        stream(), page_cache._get_current_object(), full_key, current_app.config["PAGE_CACHE_MAX_SIZE"]
+    ))
+
+def render_list(stream):
+    # Flash poruke se brišu iz sessiona tijekom rendera, a cookie se šalje prije
+    # tijela – zato se stranica s flash porukom renderira cijela, bez streama
+    if session.get("_flashes"):
+        return "".join(stream())
+    return html_response(stream())
+
+# 🏷️ Uvjetni odgovori (ETag / Last-Modified) iz verzija tablica
+def deploy_stamp():
+    """Otisak izdanja, koda, predložaka i statičkih datoteka: novi deploy mijenja sve ETagove."""
+    stamp = current_app.extensions.get("deploy_stamp")
+    if stamp is None:
+        dijelovi, zadnja_promjena = [current_app.config["RELEASE"]], 0
+        putanje = [os.path.join(current_app.config["ASSETS_DIR"], "manifest.json")]
+        # Deploy koji mijenja samo Python kod (rute, upiti) mijenja i HTML
+        putanje += sorted(
+            os.path.join(current_app.root_path, f) for f in os.listdir(current_app.root_path) if f.endswith(".py")
+        )
+        for root, _, files in os.walk(os.path.join(current_app.root_path, current_app.template_folder)):
+            putanje += [os.path.join(root, f) for f in sorted(files)]
+        for putanja in putanje:
+            try:
+                st = os.stat(putanja)
+            except OSError:
+                continue
+            dijelovi.append(f"{putanja}:{st.st_size}:{st.st_mtime_ns}")
+            zadnja_promjena = max(zadnja_promjena, int(st.st_mtime))
+        stamp = (
+            hashlib.sha1("|".join(dijelovi).encode()).hexdigest()[:12],
+            datetime.utcfromtimestamp(zadnja_promjena),
+        )
+        current_app.extensions["deploy_stamp"] = stamp
+    return stamp
+
+def session_role():
+    if session.get("admin_logged"):
+        return "admin"
+    return "user" if session.get("logged_in") else "anon"
+
+def conditional(*tables, vary_query=None):
+    """
+    ETag = verzije tablica + uloga + deploy. Ako se klijentov ETag (ili datum) poklapa,
+    vraća se 304 prije ijednog upita nad podacima i prije rendera predloška.
+    Last-Modified šaljemo samo anonimnima: datum se ne mijenja prijavom, a ETag da.
+    `vary_query`: funkcija koja vraća normalizirane parametre upita (API), pa su
+    i oni dio ETaga; ako baci ValueError (neispravan upit → 400), odgovor ide
+    bez ETaga.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Flash poruka se troši renderom, pa takav odgovor ne smije biti 304
+            if session.get("_flashes"):
+                return view(*args, **kwargs)
+
+            try:
+                query = repr(vary_query()) if vary_query else ""
+            except ValueError:
+                return view(*args, **kwargs)
+
+            role = session_role()
+            stamp, deployed_at = deploy_stamp()
+            versions = read_versions(db, TableVersion, tables) if tables else {}
+            g.etag = hashlib.sha1(
+                f"{stamp}|{role}|{sorted((n, v) for n, (v, _) in versions.items())}|{query}".encode()
+            ).hexdigest()[:20]
+
+            last_modified = None
+            if role == "anon":
+                last_modified = max([deployed_at] + [t for _, t in versions.values()])
+                # Promjena unutar trenutne sekunde ne bi pomaknula datum – tada samo ETag
+                if datetime.utcnow() - last_modified < timedelta(seconds=1):
+                    last_modified = None
+
+            def with_validators(response):
+                response.set_etag(g.etag)
+                if last_modified:  # Werkzeug bi za None upisao trenutno vrijeme
+                    response.last_modified = last_modified
+                response.headers["Cache-Control"] = "no-cache"
+                response.vary.add("Cookie")
+                return response
+
+            if not is_resource_modified(request.environ, etag=g.etag, last_modified=last_modified):
+                return with_validators(Response(status=304))
+            return with_validators(current_app.make_response(view(*args, **kwargs)))
+        return wrapper
+    return decorator
+
+# 🔹 Početna stranica
+@bp.route("/")
+@conditional()
+def index():
+    return render_template("index.html")
+
+# 🔹 Dodavanje novog tečaja
+@bp.route("/add_course", methods=["GET", "POST"])
+def add_course():
+    if not session.get("admin_logged"):
+        flash("⛔ Pristup dozvoljen samo administratoru.", "danger")
+        return redirect(url_for("main.admin_login"))
+
+    if request.method == "POST":
+        naziv = request.form["naziv"]
+        opis = request.form["opis"]
+        cijena = request.form["cijena"]
+
+        try:
+            # ➕ Kreiraj novi tečaj
+            novi_tecaj = Course(naziv=naziv, opis=opis, cijena=float(cijena))
+            db.session.add(novi_tecaj)
+
+            # ✅ Prvo spremi u bazu
+            db.session.commit()
+            page_cache.invalidate("courses")
+
+            # 💾 Tek sad pokreni backup jer je baza ažurirana (radi se u pozadini)
+            backup_manager.request()
+
+            flash("✅ Tečaj je uspješno dodan i backup je pokrenut!", "success")
+            return redirect(url_for("main.courses"))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f"⚠️ Greška pri dodavanju tečaja: {e}", "danger")
+            return redirect(url_for("main.add_course"))
+
+    return render_template("add_course.html")
+
+# Uredi tečaj
+@bp.route("/edit_course/<int:id>", methods=["GET", "POST"])
+def edit_course(id):
+    if not session.get("admin_logged"):
+        flash("⛔ Pristup dozvoljen samo administratoru.", "danger")
+        return redirect(url_for("main.admin_login"))
+    course = Course.query.get_or_404(id)
+
+    if request.method == "POST":
+        course.naziv = request.form["naziv"]
+        course.opis = request.form["opis"]
+        course.cijena = float(request.form["cijena"])
+
+        try:
+            db.session.commit()
+            page_cache.invalidate("courses")
+            flash("✅ Tečaj je uspješno ažuriran!", "success")
+            return redirect(url_for("main.courses"))
+        except Exception as e:
+            db.session.rollback()
+            flash(f"⚠️ Greška prilikom ažuriranja: {e}", "danger")
+
+    return render_template("edit_course.html", course=course)
+
+# Brisanje tečaja
+@bp.route("/delete_course/<int:id>", methods=["POST"])
+def delete_course(id):
+    if not session.get("admin_logged"):
+        flash("⛔ Pristup dozvoljen samo administratoru.", "danger")
+        return redirect(url_for("main.admin_login"))
+    course = Course.query.get_or_404(id)
+    try:
+        db.session.delete(course)
+        db.session.commit()
+        page_cache.invalidate("courses")
+        flash("❌ Tečaj je uspješno obrisan.", "success")
+    except Exception as e:
+        db.session.rollback()
+        flash(f"⚠️ Greška pri brisanju tečaja: {e}", "danger")
+
+    return redirect(url_for("main.courses"))
+
+# 🔹 Prikaz svih tečajeva
+@bp.route("/courses")
+@conditional("course")
+def courses():
+    return cached_page("courses", lambda: stream_page(
+        "courses.html", courses=iter_rows(db, Course, ("id", "naziv", "opis", "cijena"))
+    ))
+
+# 🔹 Pregled svih događaja
+@bp.route("/events")
+@conditional("event")
+def events():
+    return cached_page("events", lambda: stream_page(
+        "events.html", events=iter_rows(db, Event, ("id", "naziv", "opis"))
+    ))
+
+# 🔌 JSON API za mobilnu stranicu i widgete (vidi api.py)
+def api_query(resource):
+    """Parsirani (fields, ids, after, limit) za ovaj zahtjev; ApiError ako ne valjaju."""
+    if "api_query" not in g:
+        _model, allowed, _table = api.RESOURCES[resource]
+        g.api_query = api.parse_query(request.args, allowed, current_app.config["API_PER_PAGE"])
+    return g.api_query
+
+def api_response(resource):
+    try:
+        fields, ids, after, limit = api_query(resource)
+    except api.ApiError as e:
+        return jsonify(error=str(e)), 400
+
+    def build():
+        return api.build_payload(db, resource, fields, ids=ids, after=after, limit=limit)
+
+    etag = g.get("etag")
+    # Ključ je ETag (verzije + parsirani parametri), pa cache i 304 uvijek govore o istoj verziji
+    body = page_cache.get_or_set(resource, f"api:{etag}", build) if etag else build()
+    response = Response(body, mimetype="application/json")
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    return response
+
+@bp.route("/api/courses")
+@conditional("course", vary_query=lambda: api_query("courses"))
+def api_courses():
+    return api_response("courses")
+
+@bp.route("/api/events")
+@conditional("event", vary_query=lambda: api_query("events"))
+def api_events():
+    return api_response("events")
+
+# 🔎 Pretraživanje (vidi search.py)
+def render_search(sources, endpoint):
+    q = request.args.get("q", "").strip()[:200]
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = current_app.config["SEARCH_PER_PAGE"]
+
+    rezultati, ima_jos = {}, False
+    if q:
+        for source in sources:
+            rezultati[source], vise = search.search(db, source, q, page, per_page)
+            ima_jos = ima_jos or vise
+    return render_template(
+        "search.html", q=q, page=page, rezultati=rezultati, ima_jos=ima_jos, endpoint=endpoint
+    )
+
+@bp.route("/search")
+def search_page():
+    return render_search(("courses", "events"), "main.search_page")
+
+@bp.route("/admin/search")
+def admin_search():
+    return render_search(("contacts", "courses", "events"), "main.admin_search")
+
+
+# 🔹 Dodavanje događaja (samo admin)
+@bp.route("/add_event", methods=["GET", "POST"])
+def add_event():
+    if not session.get("admin_logged"):
+        flash("Pristup dopušten samo administratoru.", "warning")
+        return redirect(url_for("main.admin_login"))
+
+    if request.method == "POST":
+        naziv = request.form["naziv"]
+        opis = request.form["opis"]
+
+        try:
+            novi = Event(naziv=naziv, opis=opis, kapacitet=parse_kapacitet(request.form.get("kapacitet")))
+            db.session.add(novi)
+            db.session.commit()
+            page_cache.invalidate("events")
+            flash("✅ Događaj je uspješno dodan!", "success")
+            return redirect(url_for("main.events"))
+        except Exception as e:
+            db.session.rollback()
+            flash(f"⚠️ Greška pri dodavanju događaja: {e}", "danger")
+
+    return render_template("add_event.html")
+
+# 🔹 Uredi događaj (samo admin)
+@bp.route("/edit_event/<int:id>", methods=["GET", "POST"])
+def edit_event(id):
+    if not session.get("admin_logged"):
+        flash("Pristup dopušten samo administratoru.", "warning")
+        return redirect(url_for("main.admin_login"))
+
+    event = Event.query.get_or_404(id)
+
+    if request.method == "POST":
+        event.naziv = request.form["naziv"]
+        event.opis = request.form["opis"]
+
+        try:
+            event.kapacitet = parse_kapacitet(request.form.get("kapacitet"))
+            db.session.commit()
+            page_cache.invalidate("events")
+            flash("✅ Događaj je uspješno ažuriran!", "success")
+            return redirect(url_for("main.events"))
+        except Exception as e:
+            db.session.rollback()
+            flash(f"⚠️ Greška pri ažuriranju događaja: {e}", "danger")
+
+    return render_template("edit_event.html", event=event)
+
+# 🔹 Naziv i kapacitet događaja (cache se poništava zajedno sa stranicom /events)
+def event_info(event_id):
+    def load():
+        event = db.session.get(Event, event_id)
+        return {"id": event.id, "naziv": event.naziv, "kapacitet": event.kapacitet} if event else {}
+    return page_cache.get_or_set("events", f"event:{event_id}", load) or None
+
+def parse_kapacitet(value):
+    value = (value or "").strip()
+    return max(int(value), 0) if value else None
+
+# 🔹 Prijava na događaj
+@bp.route("/register_event/<int:event_id>", methods=["GET", "POST"])
+def register_event(event_id):
+    event = event_info(event_id)
+    if event is None:
+        abort(404)
+    event_naziv = event["naziv"]
+
+    if request.method == "POST":
+        ime = request.form["ime"]
+        email = request.form["email"]
+        poruka = request.form.get("poruka", "")
+
+        def prijavi():
+            # Brojač i kapacitet u jednom UPDATE-u: dvije istovremene prijave
+            # na zadnje mjesto ne mogu obje proći (red je zaključan do commita)
+            zauzeto = db.session.execute(
+                update(Event)
+                .where(Event.id == event_id)
+                .where(or_(Event.kapacitet.is_(None), Event.broj_prijava < Event.kapacitet))
+                .values(broj_prijava=Event.broj_prijava + 1)
+            ).rowcount
+            if not zauzeto:
+                return False
+
+            nova_prijava = EventRegistration(
+                ime=ime,
+                email=email,
+                event_id=event_id,
+                event_naziv=event_naziv,
+                poruka=poruka
+            )
+            db.session.add(nova_prijava)
+
+            # 📬 Potvrda e-mailom ide u red, u istoj transakciji kao i prijava
+            mail_queue.enqueue(
+                subject=f"Potvrda prijave za {event_naziv}",
+                recipients=[email],
+                body=f"Hvala {ime}, uspješno ste se prijavili na događaj '{event_naziv}'."
+            )
+            return True
+
+        try:
+            # Commit radi ingest (sam ili zajedno s drugim prijavama – vidi ingest.py)
+            if not ingest.run(prijavi):
+                flash("⚠️ Nažalost, prijave za ovaj događaj su popunjene.", "warning")
+                return redirect(url_for("main.events"))
+            mail_queue.notify()
+
+            flash("✅ Uspješno ste se prijavili! Potvrda je poslana e-mailom.", "success")
+            return redirect(url_for("main.events"))
+        except Exception as e:
+            db.session.rollback()
+            flash(f"⚠️ Greška pri prijavi: {e}", "danger")
+
+    slobodno = None
+    if event["kapacitet"] is not None:
+        broj = db.session.execute(select(Event.broj_prijava).where(Event.id == event_id)).scalar() or 0
+        slobodno = max(event["kapacitet"] - broj, 0)
+    return render_template("register_event.html", event_naziv=event_naziv, slobodno=slobodno)
+
+# 🔹 Popis prijava za jedan događaj (admin)
+@bp.route("/admin/events/<int:event_id>/registrations")
+def admin_event_registrations(event_id):
+    event = Event.query.get_or_404(event_id)
+    per_page = request.args.get("per_page", current_app.config["MESSAGES_PER_PAGE"], type=int)
+    stranica = keyset_paginate(
+        EventRegistration.query.filter(EventRegistration.event_id == event_id),
+        EventRegistration.id,
+        max(1, min(per_page, 200)),
+        after=request.args.get("after", type=int),
+        before=request.args.get("before", type=int),
+    )
+    u_arhivi = archive.archived_totals(db, event_id)["event_registration"]
+    obavijesti = (Announcement.query.filter(Announcement.event_id == event_id)
+                  .order_by(Announcement.id.desc()).limit(10).all())
+    return render_template("event_registrations.html", event=event, prijave=stranica.items,
+                           stranica=stranica, u_arhivi=u_arhivi, obavijesti=obavijesti)
+
+# 📣 Obavijest svima prijavljenima (šalje se u pozadini, vidi bulk_mail.py)
+@bp.route("/admin/events/<int:event_id>/announce", methods=["POST"])
+def admin_announce(event_id):
+    event = Event.query.get_or_404(event_id)
+    try:
+        obavijest = bulk_mailer.create(event, request.form["subject"].strip(), request.form["body"])
+        db.session.commit()
+    except ValueError as e:
+        db.session.rollback()
+        flash(f"⚠️ {e}", "danger")
+        return redirect(url_for("main.admin_event_registrations", event_id=event_id))
+
+    bulk_mailer.notify()
+    flash(f"📣 Obavijest je u redu za slanje ({obavijest.total} primatelja).", "success")
+    return redirect(url_for("main.admin_event_registrations", event_id=event_id))
+
+@bp.route("/admin/announcements/<int:id>/<akcija>", methods=["POST"])
+def admin_announcement_action(id, akcija):
+    if akcija not in ("cancel", "resume"):
+        abort(404)
+    obavijest = Announcement.query.get_or_404(id)
+    if akcija == "cancel" and bulk_mailer.cancel(id):
+        flash("⏹️ Slanje obavijesti je zaustavljeno.", "info")
+    elif akcija == "resume" and bulk_mailer.resume(id):
+        bulk_mailer.notify()
+        flash("▶️ Slanje obavijesti se nastavlja.", "success")
+    if obavijest.event_id is None:  # događaj je u međuvremenu obrisan
+        return redirect(url_for("main.admin_dashboard"))
+    return redirect(url_for("main.admin_event_registrations", event_id=obavijest.event_id))
+
+# 🔹 Kontakt forma
+@bp.route("/contact", methods=["GET", "POST"])
+def contact():
+    if request.method == "POST":
+        ime = request.form["ime"]
+        email = request.form["email"]
+        poruka = request.form["poruka"]
+
+        def spremi():
+            db.session.add(Contact(ime=ime, email=email, poruka=poruka))
+
+            # E-mail obavijest ide u red (šalje se u pozadini)
+            notify_to = os.getenv("MAIL_NOTIFY_TO")
+            if notify_to:
+                mail_queue.enqueue(
+                    subject=f"Nova poruka od {ime}",
+                    recipients=[notify_to],
+                    body=f"Ime: {ime}\nEmail: {email}\n\nPoruka:\n{poruka}"
+                )
+
+        ingest.run(spremi)
+        mail_queue.notify()
+
+        return render_template("thank_you.html", ime=ime)
+    return render_template("contact.html")
+
+# 🔹 Login za korisnike
+@bp.route("/user/login", methods=["GET", "POST"])
+def user_login():
+    if request.method == "POST":
+        username = request.form["username"]
+        password = request.form["password"]
+
+        if username == "admin" and password == "12345":
+            session["logged_in"] = True
+            flash("Uspješna prijava!", "success")
+            return redirect(url_for("main.user_messages"))
+        else:
+            flash("Pogrešno korisničko ime ili lozinka!", "danger")
+
+    return render_template("user_login.html")
+
+# USER: Pregled vlastitih poruka (za obične korisnike)
+@bp.route("/user/messages")
+def user_messages():
+    if not session.get("logged_in"):
+        flash("Prijavi se za pristup svojim porukama.", "warning")
+        return redirect(url_for("main.user_login"))
+    
+    return render_messages_page()
+
+# 🔹 Stranica poruka s keyset paginacijom (?after=<id> / ?before=<id>)
+def render_messages_page():
+    per_page = request.args.get("per_page", current_app.config["MESSAGES_PER_PAGE"], type=int)
+    per_page = max(1, min(per_page, 200))
+    stranica = keyset_paginate(
+        Contact.query,
+        Contact.id,
+        per_page,
+        after=request.args.get("after", type=int),
+        before=request.args.get("before", type=int),
+    )
+    return render_list(lambda: stream_page("messages.html", poruke=stranica.items, stranica=stranica))
+
+# 🔹 Admin login
+@bp.route("/admin/login", methods=["GET", "POST"])
+def admin_login():
+    if request.method == "POST":
+        username = request.form.get("username")
+        password = request.form.get("password")
+
+        # provjera kredencijala iz .env fajla
+        if (
+            username == os.getenv("ADMIN_USERNAME")
+            and password == os.getenv("ADMIN_PASSWORD")
+        ):
+            session["admin_logged"] = True
+            flash("Dobrodošao nazad, admin!", "success")
+            return redirect(url_for("main.admin_dashboard"))
+        else:
+            flash("Neispravni podaci za prijavu.", "danger")
+            return render_template("login.html")
+
+    # prikaz forme kad se otvori stranica
+    return render_template("login.html")
+
+
+@bp.route("/admin/logout")
+def admin_logout():
+    session.pop("admin_logged", None)
+    flash("Uspješno ste se odjavili.", "info")
+    return redirect(url_for("main.admin_login"))
+
+@bp.route("/test")
+def test():
+    return "Radi ✅"
+
+@bp.route("/snaga_uma")
+def snaga_uma():
+    return render_template("snaga_uma.html")
+
+@bp.route("/kontakt_snaga_uma", methods=["POST"])
+def kontakt_snaga_uma():
+    try:
+        ime = request.form["ime"]
+        email = request.form["email"]
+        poruka = request.form["poruka"]
+
+        def posalji():
+            # 📩 Poruka ide njoj
+            mail_queue.enqueue(
+                subject=f"Nova poruka za Snaga Uma - {ime}",
+                sender=email,
+                recipients=["snaguma17@gmail.com"],
+                body=f"Ime: {ime}\nE-mail: {email}\n\nPoruka:\n{poruka}"
+            )
+
+            # 📤 Auto-odgovor pošiljatelju
+            mail_queue.enqueue(
+                subject="Hvala na kontaktu - Snaga Uma",
+                sender="snaguma17@gmail.com",
+                recipients=[email],
+                body=f"""
+Poštovani {ime},
+
+Hvala vam što ste nas kontaktirali! 🌿 
+Vaša poruka je primljena i tim Snaga Uma će vam se javiti u najkraćem mogućem roku.
+
+Lijep pozdrav,  
+Snaga Uma – Partnersko savjetovanje
+"""
+            )
+
+        ingest.run(posalji)
+        mail_queue.notify()
+
+        flash("✅ Poruka je uspješno poslana! Primiti ćete potvrdu putem e-maila.", "success")
+    except Exception as e:
+        db.session.rollback()
+        flash(f"⚠️ Greška pri slanju poruke: {e}", "danger")
+
+    return redirect(url_for("main.snaga_uma"))
+
+# 🔹 Admin dashboard (jedina verzija!)
+@bp.route("/admin/dashboard")
+def admin_dashboard():
+    if not session.get("admin_logged"):
+        flash("⛔ Prijavi se kao admin da pristupiš upravljačkoj ploči.", "warning")
+        return redirect(url_for("main.admin_login"))
+
+    # Svi brojači jednim upitom, backupi iz manifesta (bez listanja direktorija)
+    brojevi = read_counts(db, TableCounter, COUNTED_MODELS)
+    arhiva = archive.archived_totals(db)
+    manifest = backup_manager.read_manifest()
+    zadnji = manifest.get("latest")
+    zadnji_backup = (
+        f"{zadnji.get('id') or zadnji.get('file')} ({zadnji['created'].replace('T', ' ')})"
+        if zadnji else "Nema dostupnih kopija."
+    )
+
+    return render_template(
+        "admin_dashboard.html",
+        broj_kurseva=brojevi["course"],
+        broj_poruka=brojevi["contact"] + arhiva["contact"],
+        broj_dogadjaja=brojevi["event"],
+        broj_prijava=brojevi["event_registration"] + arhiva["event_registration"],
+        arhiva=arhiva,
+        zadnji_backup=zadnji_backup,
+        backupi=list(reversed(manifest.get("snapshots", [])))[:10],
+        backup_zauzece=manifest.get("stored_bytes")
+    )
+
+# 🗄️ Arhiva starih poruka i prijava (upit nad archive.db tek kad admin otvori stranicu)
+ARCHIVE_VIEWS = {
+    "contacts": (ArchivedContact, ArchivedContact.datum_poruke),
+    "registrations": (ArchivedRegistration, ArchivedRegistration.datum_prijave),
+}
+
+@bp.route("/admin/archive")
+def admin_archive():
+    izvor = request.args.get("izvor", "contacts")
+    if izvor not in ARCHIVE_VIEWS:
+        abort(404)
+    model, _datum = ARCHIVE_VIEWS[izvor]
+    q = request.args.get("q", "").strip()
+    event_id = request.args.get("event_id", type=int)
+
+    upit = model.query
+    if q:
+        # Adrese su spremljene kako su upisane (i velikim slovima)
+        upit = upit.filter(or_(func.lower(model.email) == q.lower(), model.ime.ilike(f"%{q}%")))
+    if event_id is not None and izvor == "registrations":
+        upit = upit.filter(model.event_id == event_id)
+    per_page = request.args.get("per_page", current_app.config["MESSAGES_PER_PAGE"], type=int)
+    stranica = keyset_paginate(
+        upit,
+        model.id,
+        max(1, min(per_page, 200)),
+        after=request.args.get("after", type=int),
+        before=request.args.get("before", type=int),
+    )
+    return render_template(
+        "admin_archive.html",
+        izvor=izvor,
+        q=q,
+        event_id=event_id,
+        retci=stranica.items,
+        stranica=stranica,
+        po_mjesecu=archive.summary_by_month(db, izvor),
+    )
+
+# 📊 Analitika – čita samo dnevne zbrojeve (daily_stat), nikad sirove prijave i poruke
+def analytics_data():
+    od, do = analytics.date_range(request.args.get("dani", 365, type=int))
+    event_id = request.args.get("event_id", type=int)
+    return {
+        "od": od.isoformat(),
+        "do": do.isoformat(),
+        "event_id": event_id,
+        "dani": [(od + timedelta(days=i)).isoformat() for i in range((do - od).days + 1)],
+        "prijave": analytics.daily_series(db, "event_registration", od, do, event_id),
+        "poruke": analytics.daily_series(db, "contact", od, do) if event_id is None else None,
+        "dogadaji": [
+            {"event_id": e, "naziv": naziv, "broj": broj}
+            for e, naziv, broj in analytics.top_events(db, od, do)
+        ],
+    }
+
+@bp.route("/admin/analytics")
+def admin_analytics():
+    podaci = analytics_data()
+    grafovi = [("📝 Prijave", podaci["prijave"], analytics.bar_path(podaci["prijave"]))]
+    if podaci["poruke"] is not None:
+        grafovi.append(("📨 Poruke", podaci["poruke"], analytics.bar_path(podaci["poruke"])))
+    return render_template("admin_analytics.html", podaci=podaci, grafovi=grafovi,
+                           dani=len(podaci["dani"]))
+
+@bp.route("/admin/analytics.json")
+def admin_analytics_json():
+    return jsonify(analytics_data())
+
+# 🔹 Pregled poruka (za admina)    
+@bp.route("/messages")
+def messages():
+    if not session.get("admin_logged"):
+        flash("Prijavi se kao admin za pristup porukama.", "warning")
+        return redirect(url_for("main.admin_login"))
+
+    return render_messages_page()
+
+# 🔹 Ručni backup (gumb na admin dashboardu)
+@bp.route("/admin/backup", methods=["POST"])
+def admin_backup():
+    if not session.get("admin_logged"):
+        flash("⛔ Pristup dozvoljen samo administratoru.", "danger")
+        return redirect(url_for("main.admin_login"))
+
+    backup_manager.request()
+    flash("💾 Backup baze je pokrenut u pozadini.", "success")
+    return redirect(url_for("main.admin_dashboard"))
+
+# 💾 Periodički backup – pozadinska nit se pokreće s prvim zahtjevom u svakom workeru
+@bp.before_app_request
+def start_backup_scheduler():
+    if current_app.config["BACKUP_INTERVAL"]:
+        backup_manager.start()
+
+# 📨 E-mailovi koji su ostali u redu (restart, backoff) šalju se i kad nema novih formi
+@bp.before_app_request
+def start_mail_queue():
+    mail_queue.start()
+
+# 📣 Nedovršene obavijesti (npr. nakon restarta) nastavlja nit u nekom od workera
+@bp.before_app_request
+def start_bulk_mailer():
+    bulk_mailer.start()
+
+# 📈 Metrike za Prometheus (admin sesija ili METRICS_TOKEN)
+@bp.route("/admin/metrics")
+def admin_metrics():
+    if not (session.get("admin_logged") or metrics_token_ok()):
+        abort(403)
+
+    registry.flush(force=True)
+    return Response(
+        render_metrics(current_app.config["METRICS_DIR"]),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+# 🔹 Odjava (za oba tipa korisnika)
+@bp.route("/logout")
+def logout():
+    session.clear()
+    flash("Odjavljen si!", "info")
+    return redirect(url_for("main.index"))
+
+# 📈 Mjerenje trajanja zahtjeva (mora biti prije provjere autorizacije)
+@bp.before_app_request
+def start_request_timer():
+    g.request_t0 = time.perf_counter()
+
+@bp.after_app_request
+def record_request_metrics(response):
+    t0 = g.get("request_t0")
+    if t0 is None:
+        return response
+    # Streamane stranice (/courses, /events...) rade upite i render tek dok se tijelo
+    # šalje – mjeri se kad server zatvori odgovor, a g se do tada čuva u zatvaranju
+    zahtjev_g = g._get_current_object()
+    endpoint, method, status = request.endpoint or "404", request.method, response.status_code
+
+    def record():
+        registry.observe("versus_http_request_duration_seconds", time.perf_counter() - t0,
+                         endpoint=endpoint, method=method)
+        registry.inc("versus_http_requests_total", endpoint=endpoint, status=status)
+        registry.observe("versus_request_sql_queries", zahtjev_g.get("sql_queries", 0), endpoint=endpoint)
+        registry.observe("versus_request_sql_seconds", zahtjev_g.get("sql_seconds", 0.0), endpoint=endpoint)
+        registry.flush()
+
+    response.call_on_close(record)
+    return response
+
+def metrics_token_ok():
+    token = current_app.config["METRICS_TOKEN"]
+    return bool(token) and hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    )
+
+# 🚦 Rate limit za forme – 429 prije ikakvog rada s bazom ili e-mailom
+RATE_LIMITED = {"main.contact", "main.kontakt_snaga_uma", "main.register_event"}
+
+@bp.before_app_request
+def rate_limit():
+    if (
+        request.method != "POST"
+        or request.endpoint not in RATE_LIMITED
+        or not current_app.config["RATELIMIT_ENABLED"]
+    ):
+        return None
+
+    odbijeno = rate_limiter.check(
+        request.endpoint,
+        ip=request.remote_addr,
+        email=request.form.get("email", "").strip().lower(),
+    )
+    if odbijeno is None:
+        return None
+    scope, retry_after = odbijeno
+    registry.inc("versus_ratelimit_rejected_total", endpoint=request.endpoint, scope=scope)
+    return Response(
+        "Previše zahtjeva – pokušajte ponovno kasnije.\n",
+        status=429,
+        mimetype="text/plain",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+# 🔹 Provjera autorizacije
+@bp.before_app_request
+def require_login():
+    # Prometheus se može prijaviti tokenom umjesto admin sesijom
+    if request.path == "/admin/metrics" and metrics_token_ok():
+        return None
+
+    # Ako URL počinje s "/admin" ali NIJE login stranica
+    if request.path.startswith("/admin") and not request.path.startswith("/admin/login"):
+        if not session.get("admin_logged"):
+            return redirect(url_for("main.admin_login"))
+    
+    # Ako su ovo "user-only" rute
+    if request.path.startswith("/user") and not request.path.startswith("/user/login"):
+        if not session.get("logged_in"):
+            return redirect(url_for("main.user_login"))
+        
+# 📤 Izvoz / uvoz podataka (vidi data_io.py)
+EXPORTS = {
+    "courses": (Course, ["id", "naziv", "opis", "cijena"]),
+    "events": (Event, ["id", "naziv", "opis", "kapacitet", "broj_prijava"]),
+    "registrations": (EventRegistration, ["id", "ime", "email", "event_id", "event_naziv", "poruka", "datum_prijave"]),
+    "contacts": (Contact, ["id", "ime", "email", "poruka", "datum_poruke"]),
+}
+
+def _clean_course(rec):
+    naziv = (rec.get("naziv") or "").strip()
+    if not naziv:
+        raise ValueError("naziv je obavezan")
+    cijena = rec.get("cijena")
+    return {
+        "naziv": naziv[:100],
+        "opis": rec.get("opis") or None,
+        "cijena": float(cijena) if cijena not in (None, "") else None,
+    }
+
+def _clean_event(rec):
+    naziv = (rec.get("naziv") or "").strip()
+    if not naziv:
+        raise ValueError("naziv je obavezan")
+    kapacitet = rec.get("kapacitet")
+    return {
+        "naziv": naziv[:150],
+        "opis": rec.get("opis") or None,
+        "kapacitet": parse_kapacitet(str(kapacitet)) if kapacitet is not None else None,
+    }
+
+IMPORTS = {
+    "courses": (Course, "course", _clean_course),
+    "events": (Event, "event", _clean_event),
+}
+
+def import_records(table, records):
+    model, counter, clean = IMPORTS[table]
+    try:
+        rezultat = bulk_import(
+            db, model, records, clean,
+            on_batch=lambda n: (
+                bump_count(db, TableCounter, counter, n), bump_version(db, TableVersion, counter)
+            ),
+        )
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        page_cache.invalidate(table)
+    return rezultat
+
+@bp.route("/admin/export/<table>.<fmt>")
+def admin_export(table, fmt):
+    if table not in EXPORTS or fmt not in ("csv", "jsonl"):
+        abort(404)
+    model, fields = EXPORTS[table]
+    generator = export_csv if fmt == "csv" else export_jsonl
+    return Response(
+        stream_with_context(generator(db, model, fields)),
+        mimetype="text/csv" if fmt == "csv" else "application/x-ndjson",
+        headers={"Content-Disposition": f"attachment; filename={table}.{fmt}"},
+    )
+
+@bp.route("/admin/import/<table>", methods=["POST"])
+def admin_import(table):
+    if table not in IMPORTS:
+        abort(404)
+    datoteka = request.files.get("datoteka")
+    if not datoteka or not datoteka.filename:
+        flash("⚠️ Odaberi CSV ili JSONL datoteku.", "warning")
+        return redirect(url_for("main.admin_dashboard"))
+
+    fmt = "jsonl" if datoteka.filename.endswith((".jsonl", ".json")) else "csv"
+    stream = io.TextIOWrapper(datoteka.stream, encoding="utf-8-sig", newline="")
+    try:
+        uvezeno, greske = import_records(table, read_records(stream, fmt))
+        flash(f"✅ Uvezeno zapisa: {uvezeno}", "success")
+        if greske:
+            flash(f"⚠️ Preskočeno {len(greske)} redaka: " + "; ".join(greske[:5]), "warning")
+    except Exception as e:
+        flash(f"⚠️ Greška pri uvozu: {e}", "danger")
+    return redirect(url_for("main.admin_dashboard"))
+
+# 🔹 Brisanje događaja
+@bp.route("/delete_event/<int:id>", methods=["POST"])
+def delete_event(id):
+    if not session.get("admin_logged"):
+        flash("❌ Pristup odbijen! Samo admin može brisati događaje.", "danger")
+        return redirect(url_for("main.events"))
+
+    try:
+        event = Event.query.get_or_404(id)
+        # Prijave ostaju (s nazivom događaja), samo više nisu vezane uz njega
+        EventRegistration.query.filter(EventRegistration.event_id == id).update({"event_id": None})
+        Announcement.query.filter(Announcement.event_id == id).update({"event_id": None})
+        db.session.delete(event)
+        db.session.commit()
+        page_cache.invalidate("events")
+        flash("✅ Događaj uspješno obrisan!", "success")
+    except Exception as e:
+        db.session.rollback()
+        flash(f"⚠️ Greška pri brisanju događaja: {e}", "danger")
+
+    return redirect(url_for("main.events"))
@@ -0,0 +1,133 @@
+# search.py
+"""
+Pretraživanje tečajeva, događaja i poruka.
+
+SQLite: FTS5 virtualne tablice s vanjskim sadržajem (content=...) koje prate
+        course, event i contact. Triggeri ih ažuriraju na svaki INSERT,
+        DELETE i UPDATE indeksiranih stupaca (i za skupni uvoz), pa indeks
+        nikad ne treba graditi ispočetka. Rezultati su rangirani po bm25 (FTS5 `rank`), a indeks
+        prefiksa od 2 i 3 slova drži upite "dok korisnik tipka" brzima.
+Postgres: to_tsvector / plainto_tsquery s GIN indeksom na istom izrazu.
+"""
+from markupsafe import Markup, escape
+from sqlalchemy import text
+
+# naziv izvora: (tablica, stupci)
+SOURCES = {
+    "courses": ("course", ("naziv", "opis")),
+    "events": ("event", ("naziv", "opis")),
+    "contacts": ("contact", ("ime", "email", "poruka")),
+}
+
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+def _fts_table(table):
+    return f"{table}_fts"
+
+
+def install(db):
+    """Kreira indekse i triggere (idempotentno). Poziva se iz `flask init-db`."""
+    dialect = db.engine.dialect.name
+    with db.engine.begin() as conn:
+        for table, columns in SOURCES.values():
+            if dialect == "sqlite":
+                _install_sqlite(conn, table, columns)
+            elif dialect == "postgresql":
+                expr = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_search "
+                    f"ON {table} USING gin (to_tsvector('simple', {expr}))"
+                ))
+
+
+def _install_sqlite(conn, table, columns):
+    fts = _fts_table(table)
+    postoji = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+    ).first()
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END"
+    ))
+    # Samo izmjena indeksiranih stupaca – npr. event.broj_prijava mijenja se sa
+    # svakom prijavom i ne smije svaki put brisati i ponovno upisivati FTS redak
+    au_sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = :name"), {"name": f"{fts}_au"}
+    ).scalar()
+    if au_sql and "UPDATE OF" not in au_sql.upper():
+        conn.execute(text(f"DROP TRIGGER {fts}_au"))  # stari trigger na svaki UPDATE
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END"
+    ))
+    if not postoji:
+        # Jednokratno punjenje postojećih redaka; dalje sve ide kroz triggere
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+
+def fts_query(q):
+    """Korisnički upit → siguran FTS5 upit: svaka riječ u navodnicima, zadnja kao prefiks."""
+    rijeci = ['"' + r.replace('"', '""') + '"' for r in q.split()][:10]
+    if not rijeci:
+        return None
+    if len(rijeci[-1]) > 3:  # prefiks tek od 2 slova (uz navodnike), inače pogađa pola indeksa
+        rijeci[-1] += "*"
+    return " ".join(rijeci)
+
+
+def _highlight(snippet):
+    html = str(escape(snippet))
+    return Markup(html.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>"))
+
+
+def search(db, source, q, page=1, per_page=20):
+    """Vraća (rezultati, ima_još). Svaki rezultat je dict sa stupcima + 'id' i 'isjecak'."""
+    table, columns = SOURCES[source]
+    offset = (max(page, 1) - 1) * per_page
+    dialect = db.engine.dialect.name
+
+    if dialect == "sqlite":
+        upit = fts_query(q)
+        if not upit:
+            return [], False
+        fts = _fts_table(table)
+        cols = ", ".join(f"t.{c}" for c in columns)
+        rows = db.session.execute(text(
+            f"SELECT t.id, {cols}, "
+            f"snippet({fts}, -1, '{_MARK_START}', '{_MARK_END}', '…', 12) AS isjecak "
+            f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+            f"WHERE {fts} MATCH :q ORDER BY {fts}.rank LIMIT :limit OFFSET :offset"
+        ), {"q": upit, "limit": per_page + 1, "offset": offset}).mappings().all()
+    else:
+        if not q.strip():
+            return [], False
+        expr = " || ' ' || ".join(f"coalesce({c}, '')" for c in columns)
+        cols = ", ".join(columns)
+        rows = db.session.execute(text(
+            f"SELECT id, {cols}, NULL AS isjecak FROM {table} "
+            f"WHERE to_tsvector('simple', {expr}) @@ plainto_tsquery('simple', :q) "
+            f"ORDER BY ts_rank(to_tsvector('simple', {expr}), plainto_tsquery('simple', :q)) DESC "
+            f"LIMIT :limit OFFSET :offset"
+        ), {"q": q, "limit": per_page + 1, "offset": offset}).mappings().all()
+
+    rezultati = []
+    for row in rows[:per_page]:
+        rezultat = dict(row)
+        rezultat["isjecak"] = _highlight(row["isjecak"]) if row["isjecak"] else None
+        rezultati.append(rezultat)
+    return rezultati, len(rows) > per_page
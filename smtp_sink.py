@@ -0,0 +1,130 @@
+# smtp_sink.py
+"""
+Lokalni "lažni" SMTP server za razvoj, testiranje i benchmarke.
+Prima poruke kao pravi server, ali ih samo sprema u memoriju (ništa ne šalje dalje).
+
+Pokretanje:  python smtp_sink.py --port 1025
+Zatim u .env:  MAIL_SERVER=localhost  MAIL_PORT=1025  MAIL_USE_TLS=False
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode())
+
+    def handle(self):
+        sink = self.server.sink
+        sink.connected()
+        if sink.delay:
+            time.sleep(sink.delay)
+        self.reply("220 smtp-sink spreman")
+        mail_from, rcpt_to = None, []
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            cmd = line[:4].upper()
+
+            if cmd in ("HELO", "EHLO"):
+                self.reply("250 smtp-sink")
+            elif cmd == "MAIL":
+                mail_from, rcpt_to = line[10:].strip(), []
+                self.reply("250 OK")
+            elif cmd == "RCPT":
+                rcpt_to.append(line[8:].strip())
+                self.reply("250 OK")
+            elif cmd == "DATA":
+                self.reply("354 Kraj s <CRLF>.<CRLF>")
+                data = []
+                while True:
+                    part = self.rfile.readline()
+                    if not part or part in (b".\r\n", b".\n"):
+                        break
+                    data.append(part[1:] if part.startswith(b"..") else part)
+                sink.add(mail_from, rcpt_to, b"".join(data))
+                self.reply("250 OK poruka primljena")
+            elif cmd == "RSET":
+                mail_from, rcpt_to = None, []
+                self.reply("250 OK")
+            elif cmd == "NOOP":
+                self.reply("250 OK")
+            elif cmd == "QUIT":
+                self.reply("221 Doviđenja")
+                return
+            else:
+                self.reply("502 Naredba nije podržana")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """
+    SMTP server u pozadinskoj niti. Port 0 = slobodan port koji odabere OS.
+    `delay` simulira spori handshake (sekunde po konekciji).
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, delay=0.0):
+        self.delay = delay
+        self.messages = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _SMTPHandler)
+        self._server.sink = self
+        self._thread = None
+
+    @property
+    def host(self):
+        return self._server.server_address[0]
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def connected(self):
+        with self._lock:
+            self.connections += 1
+
+    def add(self, mail_from, rcpt_to, data):
+        with self._lock:
+            self.messages.append({"from": mail_from, "to": rcpt_to, "data": data})
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokalni SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.host, args.port, args.delay).start()
+    print(f"📭 SMTP sink sluša na {sink.host}:{sink.port} (Ctrl+C za kraj)")
+    try:
+        while True:
+            time.sleep(5)
+            print(f"📨 Primljeno poruka: {len(sink.messages)}")
+    except KeyboardInterrupt:
+        sink.stop()
@@ -0,0 +1,233 @@
+# sqlprofile.py
+"""
+Profiler SQL upita (uključuje se sa SQL_PROFILE=True).
+
+Na engine(e) iz `db` kači before/after_cursor_execute i za svaki upit mjeri
+trajanje te ga pripisuje Flask endpointu koji ga je izvršio. Upiti se
+grupiraju po "otisku" (SQL bez literala i s IN (?, ?, ...) sažetim u
+jedan oblik), pa se `WHERE id = 3` i `WHERE id = 7` broje kao isti upit.
+
+U SQL_PROFILE_LOG (JSONL) zapisuje se:
+  - "slow"    – upit sporiji od SQL_SLOW_MS, s parametrima i EXPLAIN QUERY PLAN
+  - "nplus1"  – isti SELECT ponovljen ≥ SQL_NPLUS1 puta u jednom zahtjevu
+                (osim namjernih serija s execution_options(keyset_batch=True),
+                npr. data_io.iter_rows)
+  - "request" – sažetak zahtjeva: {otisak: [broj, ms, najdulji ms]} (za izvještaj)
+
+`flask sql-report` zbraja log po endpointu i otisku.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+_write_lock = threading.Lock()
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement):
+    """(otisak, normalizirani SQL)."""
+    sql = _STRING.sub("?", statement)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?...)", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    return hashlib.sha1(sql.encode()).hexdigest()[:12], sql
+
+
+class SQLProfiler:
+    def __init__(self, log_path, slow_ms=50, nplus1=10):
+        self.log_path = log_path
+        self.slow = slow_ms / 1000
+        self.nplus1 = nplus1
+        self._seen = set()  # otisci čiji je SQL već zapisan u log (po procesu)
+        self._pid = os.getpid()
+        self._engines = {}  # id(engine) → (bind, dijalekt)
+
+    def attach(self, engine, name):
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+        self._engines[id(engine)] = (name, engine.dialect.name)
+
+    # 🔹 Mjerenje jednog upita
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sqlprofile_t0", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("sqlprofile_t0")
+        if not starts:
+            return
+        trajanje = time.perf_counter() - starts.pop()
+        fp, sql = fingerprint(statement)
+
+        if has_request_context():
+            stats = g.setdefault("sqlprofile", {})
+            zapis = stats.get(fp)
+            if zapis is None:
+                serija = bool(context is not None and context.execution_options.get("keyset_batch"))
+                zapis = stats[fp] = [0, 0.0, 0.0, sql, serija]
+            zapis[0] += 1
+            zapis[1] += trajanje
+            zapis[2] = max(zapis[2], trajanje)
+
+        if trajanje >= self.slow:
+            bind, dialect = self._engines.get(id(conn.engine), ("?", conn.dialect.name))
+            self._write({
+                "kind": "slow",
+                **self._where(),
+                "bind": bind,
+                "ms": round(trajanje * 1000, 2),
+                "fp": fp,
+                "sql": statement,
+                "params": repr(parameters)[:500],
+                "plan": None if executemany else self._explain(conn, dialect, statement, parameters),
+            })
+
+    def _error(self, context):
+        # Neuspjeli upit nema after_cursor_execute – makni njegov početak sa stoga konekcije
+        starts = context.connection.info.get("sqlprofile_t0") if context.connection is not None else None
+        if starts:
+            starts.pop()
+
+    def _explain(self, conn, dialect, statement, parameters):
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            return [f"(EXPLAIN nije uspio: {e})"]
+        # SQLite: (id, parent, notused, detail); Postgres: (redak plana,)
+        return [str(r[-1]) for r in rows]
+
+    # 🔹 Kraj zahtjeva – kad server zatvori odgovor, pa i streamani odgovori su gotovi
+    def after_request(self, response):
+        zahtjev_g, where = g._get_current_object(), self._where()
+        response.call_on_close(lambda: self.finish_request(zahtjev_g, where))
+        return response
+
+    def finish_request(self, zahtjev_g, where):
+        stats = zahtjev_g.pop("sqlprofile", None)
+        if not stats:
+            return
+        for fp, (broj, ukupno, _najdulje, sql, serija) in stats.items():
+            if broj >= self.nplus1 and not serija and sql.upper().startswith("SELECT"):
+                self._write({"kind": "nplus1", **where, "fp": fp, "count": broj,
+                             "ms": round(ukupno * 1000, 2), "sql": sql})
+        # Nakon forka ili rotacije loga SQL tekst treba zapisati ponovno
+        if self._pid != os.getpid() or not os.path.exists(self.log_path):
+            self._pid, self._seen = os.getpid(), set()
+        novi = {fp: s[3] for fp, s in stats.items() if fp not in self._seen}
+        self._seen.update(novi)
+        self._write({
+            "kind": "request",
+            **where,
+            "stats": {fp: [s[0], round(s[1] * 1000, 3), round(s[2] * 1000, 3)] for fp, s in stats.items()},
+            "sql": novi,
+        })
+
+    def _where(self):
+        if has_request_context():
+            return {"endpoint": request.endpoint or "404", "method": request.method}
+        return {"endpoint": "(pozadina)", "method": "-"}
+
+    def _write(self, record):
+        record["ts"] = round(time.time(), 3)
+        record["pid"] = os.getpid()
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with _write_lock, open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def init_app(app, db):
+    if not app.config["SQL_PROFILE"]:
+        return None
+    profiler = SQLProfiler(
+        app.config["SQL_PROFILE_LOG"],
+        slow_ms=app.config["SQL_SLOW_MS"],
+        nplus1=app.config["SQL_NPLUS1"],
+    )
+    with app.app_context():
+        for name, engine in db.engines.items():
+            profiler.attach(engine, name or "default")
+    app.after_request(profiler.after_request)
+    app.extensions["sqlprofile"] = profiler
+    return profiler
+
+
+# 🔹 Izvještaj (flask sql-report)
+def report(log_path, endpoint=None):
+    """
+    Vraća (po_endpointu, po_otisku, sql_po_otisku):
+      po_endpointu[ep] = {"requests", "queries", "ms", "slow", "nplus1"}
+      po_otisku[(ep, fp)] = {"count", "ms", "max_ms", "slow", "full_scan", "nplus1", "requests"}
+    """
+    po_endpointu, po_otisku, tekst = {}, {}, {}
+
+    def ep_stats(ep):
+        return po_endpointu.setdefault(ep, {"requests": 0, "queries": 0, "ms": 0.0, "slow": 0, "nplus1": 0})
+
+    def fp_stats(ep, fp):
+        return po_otisku.setdefault((ep, fp), {
+            "count": 0, "ms": 0.0, "max_ms": 0.0, "slow": 0, "full_scan": False, "nplus1": 0, "requests": 0,
+        })
+
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except ValueError:
+                continue  # nedovršen redak (proces ubijen usred pisanja)
+            ep = r.get("endpoint")
+            if endpoint and ep != endpoint:
+                continue
+            if r["kind"] == "request":
+                tekst.update(r.get("sql", {}))
+                e = ep_stats(ep)
+                e["requests"] += 1
+                for fp, (broj, ms, najdulje) in r["stats"].items():
+                    e["queries"] += broj
+                    e["ms"] += ms
+                    s = fp_stats(ep, fp)
+                    s["count"] += broj
+                    s["ms"] += ms
+                    s["max_ms"] = max(s["max_ms"], najdulje)
+                    s["requests"] += 1
+            elif r["kind"] == "slow":
+                tekst.setdefault(r["fp"], fingerprint(r["sql"])[1])
+                ep_stats(ep)["slow"] += 1
+                s = fp_stats(ep, r["fp"])
+                s["slow"] += 1
+                s["max_ms"] = max(s["max_ms"], r["ms"])
+                if any(_full_scan(line) for line in r.get("plan") or []):
+                    s["full_scan"] = True
+                if ep == "(pozadina)":  # izvan zahtjeva nema "request" zapisa
+                    s["count"] += 1
+                    s["ms"] += r["ms"]
+            elif r["kind"] == "nplus1":
+                tekst.setdefault(r["fp"], r["sql"])
+                ep_stats(ep)["nplus1"] += 1
+                fp_stats(ep, r["fp"])["nplus1"] += 1
+    return po_endpointu, po_otisku, tekst
+
+
+def _full_scan(plan_line):
+    # SQLite: "SCAN course" = cijela tablica; "SCAN ... USING INDEX" ide kroz indeks
+    # Postgres: "Seq Scan on course"
+    return (plan_line.startswith("SCAN ") and " USING " not in plan_line) or "Seq Scan" in plan_line
@@ -0,0 +1,55 @@
+# streaming.py
+"""
+Streamano renderiranje velikih stranica s popisima.
+
+Predložak se šalje klijentu dok se renderira: zaglavlje stranice odlazi
+odmah, a redovi se čitaju iz baze u serijama (data_io.iter_rows) tek kad
+ih petlja u predlošku zatraži. Vrijeme do prvog bajta i potrošnja memorije
+zato ne ovise o broju redaka.
+
+Jinja generira puno sitnih stringova, pa ih ovdje skupljamo u komade od
+~CHUNK_SIZE znakova – inače bi svaki <td> bio zaseban write na socket.
+"""
+from flask import Response, stream_template
+
+CHUNK_SIZE = 16 * 1024
+
+
+def chunked(parts, size=CHUNK_SIZE):
+    buf, n = [], 0
+    for part in parts:
+        buf.append(part)
+        n += len(part)
+        if n >= size:
+            yield "".join(buf)
+            buf, n = [], 0
+    if buf:
+        yield "".join(buf)
+
+
+def stream_page(template_name, **context):
+    """Generator HTML komada (koristi ga Response ili cache_stream)."""
+    return chunked(stream_template(template_name, **context))
+
+
+def cache_stream(chunks, page_cache, full_key, max_size):
+    """
+    Prosljeđuje komade klijentu i usput ih skuplja za page cache. Spremaju se
+    samo stranice do `max_size` znakova i samo ako je render završio do kraja
+    (prekinuta veza ili greška ne smiju ostaviti pola stranice u cacheu).
+    """
+    skupljeno, n = [], 0
+    for chunk in chunks:
+        if skupljeno is not None:
+            n += len(chunk)
+            if n > max_size:
+                skupljeno = None
+            else:
+                skupljeno.append(chunk)
+        yield chunk
+    if skupljeno is not None:
+        page_cache.store(full_key, "".join(skupljeno))
+
+
+def html_response(chunks):
+    return Response(chunks, mimetype="text/html")
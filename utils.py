@@ -1,32 +1,53 @@
 # utils.py
-import os
-import shutil
-from datetime import datetime
+from sqlalchemy import func
 
-def auto_backup():
+
+class KeysetPage:
+    """Jedna stranica rezultata + kursori za prethodnu/sljedeću stranicu."""
+
+    def __init__(self, items, prev_cursor, next_cursor, total_estimate, per_page):
+        self.items = items
+        self.prev_cursor = prev_cursor
+        self.next_cursor = next_cursor
+        self.total_estimate = total_estimate
+        self.per_page = per_page
+
+
+def keyset_paginate(query, column, per_page, after=None, before=None):
+    """
+    Keyset (kursor) paginacija, najnoviji zapisi prvi.
+    `after`  = id zadnjeg retka prethodne stranice → starije poruke
+    `before` = id prvog retka sljedeće stranice   → novije poruke
+    Svaka stranica je jedan indeksirani upit (WHERE id < ? LIMIT n),
+    pa je stranica 500 jednako brza kao stranica 1.
+    """
+    base = query
+    key = lambda row: getattr(row, column.key)
+    if before is not None:
+        rows = query.filter(column > before).order_by(column.asc()).limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        prev_cursor = key(items[0]) if has_more and items else None
+        next_cursor = key(items[-1]) if items else None
+    else:
+        if after is not None:
+            query = query.filter(column < after)
+        rows = query.order_by(column.desc()).limit(per_page + 1).all()
+        items = rows[:per_page]
+        next_cursor = key(items[-1]) if len(rows) > per_page else None
+        prev_cursor = key(items[0]) if after is not None and items else None
+
+    return KeysetPage(items, prev_cursor, next_cursor, estimate_count(base, column), per_page)
+
+
+def estimate_count(query, column):
     """
-    Automatski pravi lokalnu kopiju baze (za razvoj i testiranje).
-    Na produkciji (Render) može se proširiti da šalje kopiju u Google Drive.
+    Procjena broja redaka bez punog skeniranja: max(id) - min(id) + 1.
+    Namjerno dva upita: samostalni min()/max() SQLite čita direktno s kraja
+    indeksa, dok bi SELECT min(id), max(id) skenirao cijelu tablicu.
     """
-    try:
-        # Kreiraj direktorij za backup ako ne postoji
-        backup_dir = os.path.join(os.path.dirname(__file__), "backup")
-        os.makedirs(backup_dir, exist_ok=True)
-
-        # Naziv backup datoteke
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        backup_filename = f"versus_auto_backup_{timestamp}.db"
-        backup_path = os.path.join(backup_dir, backup_filename)
-
-        # Glavna baza
-        db_path = os.path.join(os.path.dirname(__file__), "versus.db")
-
-        # Kopiraj bazu
-        if os.path.exists(db_path):
-            shutil.copy(db_path, backup_path)
-            print(f"✅ Backup kreiran: {backup_filename}")
-        else:
-            print("⚠️ Baza nije pronađena!")
-
-    except Exception as e:
-        print(f"⚠️ Greška u backupu: {e}")
+    lo = query.with_entities(func.min(column)).scalar()
+    hi = query.with_entities(func.max(column)).scalar()
+    if lo is None or hi is None:
+        return 0
+    return hi - lo + 1